@@ -5,6 +5,7 @@ Orchestrates the news curation and posting workflow
 
 import os
 import sys
+import time
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -14,9 +15,13 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from news_fetcher import NewsFetcher
+from article_cache import ArticleCache
+from feed_poller import FeedPoller
 from tweet_generator import TweetGenerator
 from article_tracker import ArticleTracker
+from article_ranker import ArticleRanker
 from twitter_poster import TwitterPoster
+from tweet_text import MAX_WEIGHTED_LENGTH, weighted_length
 
 # Setup logging
 def setup_logging():
@@ -60,7 +65,9 @@ class TwitterNewsCurator:
         # Initialize components
         try:
             self.fetcher = NewsFetcher()
-            self.tracker = ArticleTracker()
+            self.store = ArticleCache.from_config(self.fetcher)
+            self.tracker = ArticleTracker.from_config(self.fetcher.config)
+            self.ranker = ArticleRanker.from_config(self.fetcher.config)
             
             gemini_key = os.getenv('GEMINI_API_KEY')
             if not gemini_key:
@@ -95,20 +102,65 @@ class TwitterNewsCurator:
         """
         Find a new article that hasn't been posted yet
         
+        Candidates are ranked by topic relevance and recency, best first.
+        
         Returns:
             Article dictionary or None
         """
-        logger.info("Fetching latest articles...")
-        articles = self.fetcher.fetch_latest_articles(limit=10)
-        
-        for article in articles:
-            if not self.tracker.has_been_posted(article['link']):
-                logger.info(f"✅ Found new article: {article['title']}")
-                return article
+        articles = self.find_new_articles(1)
+        if articles:
+            logger.info(f"✅ Found new article: {articles[0]['title']}")
+            return articles[0]
         
         logger.warning("No new articles found (all have been posted)")
         return None
     
+    def find_new_articles(self, count: int):
+        """
+        Find up to `count` articles that haven't been posted yet, best-ranked first
+        
+        Args:
+            count: Maximum number of articles
+        
+        Returns:
+            List of article dictionaries
+        """
+        logger.info("Reading latest articles from the article store...")
+        # No poller keeps the store fresh for a one-shot run: refetch stale feeds first
+        articles = self.ranker.rank(self.store.get_articles(limit=max(10, count), refresh_stale=True))
+        # Skips articles whose story another feed's report was already posted for
+        posted = self.tracker.posted_links(articles)
+        return [article for article in articles if article['link'] not in posted][:count]
+    
+    def draft_backlog(self, count: int):
+        """
+        Draft tweets for the best `count` unposted articles in one batch
+        
+        Drafts are generated concurrently (see TweetGenerator.generate_many)
+        and printed for review; nothing is posted or marked.
+        
+        Args:
+            count: Number of articles to draft
+        
+        Returns:
+            Per-article results from generate_many
+        """
+        articles = self.find_new_articles(count)
+        if not articles:
+            logger.warning("No new articles found (all have been posted)")
+            return []
+        
+        results = self.generator.generate_many(articles)
+        for i, result in enumerate(results, 1):
+            article = result['article']
+            print(f"\n{i}. 📰 {article['title']}")
+            if result['tweet']:
+                print(self.generator.format_final_tweet(result['tweet'], article['link']))
+            else:
+                print(f"❌ {result['error']}")
+        print()
+        return results
+    
     def generate_draft(self, article):
         """
         Generate a tweet draft for an article
@@ -121,15 +173,16 @@ class TwitterNewsCurator:
         """
         logger.info(f"Generating tweet for: {article['title']}")
         
-        tweet_content = self.generator.generate_tweet(article)
+        # One request drafts several alternatives; the best-scored one is used
+        candidates = self.generator.generate_candidates(
+            article, recent_tweets=self.tracker.recent_tweets(self.generator.recent_tweet_count)
+        )
         
-        if not tweet_content:
+        if not candidates:
             logger.error("Failed to generate tweet")
             return None, None
         
-        full_tweet = self.generator.format_final_tweet(tweet_content, article['link'])
-        
-        return tweet_content, full_tweet
+        return candidates[0]['content'], candidates[0]['full_tweet']
     
     def post_tweet(self, full_tweet: str, article):
         """
@@ -149,7 +202,7 @@ class TwitterNewsCurator:
         tweet_id = self.poster.post_tweet(full_tweet)
         
         if tweet_id:
-            self.tracker.mark_as_posted(article, tweet_id)
+            self.tracker.mark_as_posted(article, tweet_id, tweet_text=full_tweet)
             logger.info(f"✅ Tweet posted and tracked: {tweet_id}")
         
         return tweet_id
@@ -179,7 +232,7 @@ class TwitterNewsCurator:
         if not full_tweet:
             return False
         
-        print(f"🤖 Generated Tweet ({len(full_tweet)} chars):")
+        print(f"🤖 Generated Tweet ({weighted_length(full_tweet)}/{MAX_WEIGHTED_LENGTH} chars):")
         print("-" * 60)
         print(full_tweet)
         print("-" * 60 + "\n")
@@ -206,6 +259,21 @@ class TwitterNewsCurator:
             return True
 
 
+def run_poller():
+    """Keep the shared article store fresh until interrupted"""
+    fetcher = NewsFetcher()
+    store = ArticleCache.from_config(fetcher)
+    poller = FeedPoller.from_config(fetcher, store)
+    
+    logger.info(f"Polling {len(fetcher.rss_feeds)} feeds every {poller.interval}s (Ctrl+C to stop)")
+    poller.start()
+    try:
+        while poller.is_running():
+            time.sleep(1)
+    finally:
+        poller.stop()
+
+
 def main():
     """Main entry point"""
     setup_logging()
@@ -213,8 +281,19 @@ def main():
     # Check for auto-post setting
     auto_post = os.getenv('AUTO_POST', 'false').lower() == 'true'
     
+    curator = None
     try:
+        if '--poll' in sys.argv[1:]:
+            run_poller()
+            return
+        
         curator = TwitterNewsCurator(auto_post=auto_post)
+        if '--drafts' in sys.argv[1:]:
+            # python run.py --drafts 30: draft the morning backlog in one batch
+            position = sys.argv.index('--drafts') + 1
+            count = int(sys.argv[position]) if position < len(sys.argv) else 10
+            curator.draft_backlog(count)
+            return
         curator.run_once()
         
     except KeyboardInterrupt:
@@ -222,6 +301,12 @@ def main():
     except Exception as e:
         logger.error(f"\n\n❌ Error: {str(e)}", exc_info=True)
         sys.exit(1)
+    finally:
+        if curator:
+            # Writes buffered posts and folds the journal into data_file,
+            # which the scheduled workflow commits
+            curator.tracker.close()
+            curator.generator.close()
 
 
 if __name__ == "__main__":
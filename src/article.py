@@ -0,0 +1,144 @@
+"""
+Twitter News Curator - Article Module
+Compact, slotted record for a fetched news article
+"""
+
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from url_utils import canonicalize_url
+
+
+class Article:
+    """
+    A single news article
+    
+    Uses __slots__ instead of a per-instance dict, stores timestamps as
+    integer epochs and interns the feed URL (shared by every article of a
+    feed). Supports read-only dict-style access (article['link'],
+    article.get('title')) so code written against the old article dicts
+    keeps working; use to_dict() for JSON, sessions and templates that
+    need extra keys. story_id groups reports of the same story from
+    different feeds (see story_index).
+    
+    `link` is the URL as the publisher gave it, for tweets and the UI;
+    `url_key` is its canonical form (see url_utils), which the tracker and
+    indexes key on. It shares the link's string when the two are equal.
+    """
+    
+    __slots__ = ('id', 'title', 'link', 'url_key', 'summary', 'published', 'published_ts', 'source',
+                 'fetched_at', 'story_id')
+    
+    def __init__(self, title: str, link: str, summary: str = '', published: str = '',
+                 published_ts: int = 0, source: str = '', fetched_at: int = 0,
+                 id: Optional[str] = None, story_id: str = '', url_key: str = ''):
+        self.id = id
+        self.title = title
+        self.link = link
+        url_key = url_key or canonicalize_url(link)
+        self.url_key = link if url_key == link else url_key
+        self.summary = summary
+        self.published = published
+        self.published_ts = int(published_ts or 0)
+        self.source = sys.intern(source)
+        self.fetched_at = int(fetched_at or 0)
+        self.story_id = story_id
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Article":
+        """Build an Article from a dict (extra keys such as is_posted are ignored)"""
+        if isinstance(data, cls):
+            return data
+        fields = {key: data[key] for key in cls.__slots__ if key in data}
+        if isinstance(fields.get('fetched_at'), str):
+            # Files written before Article stored fetched_at as an ISO string
+            fields['fetched_at'] = datetime.fromisoformat(fields['fetched_at']).timestamp()
+        return cls(**fields)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy for jsonify, sessions and JSON files"""
+        return {key: getattr(self, key) for key in self.__slots__}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+    
+    def __hash__(self) -> int:
+        # Equal articles share their url_key, which never changes after __init__
+        return hash(self.url_key)
+    
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, title={self.title[:40]!r})"
+
+
+def article_to_json(obj):
+    """json.dump(s) `default` hook that serializes Article objects"""
+    if isinstance(obj, Article):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if __name__ == "__main__":
+    # Memory benchmark: old per-entry dicts vs Article records
+    import time
+    import tracemalloc
+    
+    count = 100_000
+    sources = [f"https://example{i}.com/feed/" for i in range(50)]
+    
+    def build_dicts():
+        return [
+            {
+                'title': f"Article title number {i}",
+                'link': f"https://example.com/news/{i}",
+                'summary': "Short summary of the article",
+                'published': 'Mon, 06 Jan 2025 10:00:00 +0000',
+                'published_parsed': time.gmtime(1736157600 + i),
+                'source': ''.join(sources[i % 50]),  # separate string per entry, as feedparser yields
+                'fetched_at': datetime.now().isoformat(),
+                'id': f"{i:016x}"
+            }
+            for i in range(count)
+        ]
+    
+    def build_articles():
+        return [
+            Article(
+                title=f"Article title number {i}",
+                link=f"https://example.com/news/{i}",
+                summary="Short summary of the article",
+                published='Mon, 06 Jan 2025 10:00:00 +0000',
+                published_ts=1736157600 + i,
+                source=''.join(sources[i % 50]),
+                fetched_at=int(time.time()),
+                id=f"{i:016x}"
+            )
+            for i in range(count)
+        ]
+    
+    results = {}
+    for name, build in (('dict', build_dicts), ('Article', build_articles)):
+        tracemalloc.start()
+        records = build()
+        canonicalize_url.cache_clear()  # shared and bounded, not part of the records
+        results[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del records
+    
+    print(f"\n📦 Memory for {count:,} articles")
+    for name, size in results.items():
+        print(f"   {name:8s} {size / 1024 / 1024:7.1f} MB  ({size / count:.0f} bytes/article)")
+    print(f"   Saved {(1 - results['Article'] / results['dict']) * 100:.0f}%\n")
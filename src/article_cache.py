@@ -0,0 +1,306 @@
+"""
+Twitter News Curator - Article Cache Module
+Shared per-feed article store in front of NewsFetcher with TTL and stale-while-revalidate
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from pathlib import Path
+
+from article import Article, article_to_json
+from article_ranker import term_counts
+from news_fetcher import merge_articles
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleCache:
+    """Holds the latest articles of every feed so readers don't hit RSS servers"""
+    
+    def __init__(self, fetcher, ttl: float = 300, max_stale: float = 3600,
+                 store_file: Optional[str] = None):
+        """
+        Initialize ArticleCache
+        
+        Args:
+            fetcher: NewsFetcher used to (re)load articles
+            ttl: Seconds a feed's articles are considered fresh
+            max_stale: Seconds stale articles may still be served while they are
+                refreshed in the background; older feeds are refetched inline
+            store_file: Optional JSON file to share the store with other processes
+        """
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.store_file = Path(store_file) if store_file else None
+        
+        # Set by FeedPoller: feeds are refreshed by the poller, never inline
+        self.background_refresh_only = False
+        
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict] = {}
+        self._refreshing = set()
+        # Bumped by invalidate(); generation of the last full clear, and of each dropped feed
+        self._generation = 0
+        self._cleared_at = 0
+        self._dropped_at: Dict[str, int] = {}
+        self._mtime = None
+        
+        self._load_data()
+    
+    @classmethod
+    def from_config(cls, fetcher) -> "ArticleCache":
+        """Build an ArticleCache from the fetcher's 'article_cache' config section"""
+        settings = fetcher.config.get('article_cache', {})
+        return cls(
+            fetcher,
+            ttl=settings.get('ttl_seconds', 300),
+            max_stale=settings.get('max_stale_seconds', 3600),
+            store_file=settings.get('store_file', 'data/article_store.json')
+        )
+    
+    def _load_data(self):
+        """Load the shared store file, if any"""
+        if not self.store_file or not self.store_file.exists():
+            return
+        
+        try:
+            mtime = self.store_file.stat().st_mtime
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                feeds = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading article store: {e}")
+            return
+        
+        for snapshot in feeds.values():
+            snapshot['articles'] = [Article.from_dict(article) for article in snapshot.get('articles', [])]
+            term_counts.add(snapshot['articles'])
+        
+        with self._lock:
+            self._feeds = feeds
+            self._mtime = mtime
+    
+    def _reload_if_changed(self):
+        """Pick up a store file rewritten by another process"""
+        if not self.store_file:
+            return
+        try:
+            mtime = self.store_file.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._load_data()
+    
+    def _save_data(self):
+        """Write the store file (atomic replace)"""
+        if not self.store_file:
+            return
+        
+        with self._lock:
+            snapshot = json.dumps(self._feeds, ensure_ascii=False, default=article_to_json)
+        
+        try:
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.store_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.store_file)
+            self._mtime = self.store_file.stat().st_mtime
+        except Exception as e:
+            logger.error(f"Error saving article store: {e}")
+    
+    def get_articles(self, limit: int = 20, sources: Optional[List[str]] = None,
+                     total_limit: Optional[int] = None, refresh_stale: bool = False) -> List[Article]:
+        """
+        Get latest articles, serving from the store when possible
+        
+        Args:
+            limit: Maximum number of articles per feed
+            sources: Feed URLs to read (defaults to all configured feeds)
+            total_limit: Maximum number of articles overall (newest first)
+            refresh_stale: Refetch feeds older than the TTL before returning
+                instead of in the background - for one-shot callers, which
+                would exit before a background refresh is of any use
+        
+        Returns:
+            List of articles, newest first
+        """
+        feeds = list(sources if sources is not None else self.fetcher.rss_feeds)
+        self._reload_if_changed()
+        
+        now = time.time()
+        missing, stale = [], []
+        with self._lock:
+            for feed_url in feeds:
+                snapshot = self._feeds.get(feed_url)
+                if not snapshot:
+                    missing.append(feed_url)
+                    continue
+                if self.background_refresh_only:
+                    continue
+                
+                age = now - snapshot['checked_at']
+                if snapshot['limit'] < limit or age > self.max_stale:
+                    missing.append(feed_url)
+                elif age > self.ttl:
+                    stale.append(feed_url)
+        
+        if refresh_stale:
+            missing += stale
+            stale = []
+        if self.background_refresh_only:
+            # Not even missing feeds are fetched on a reader's request: they
+            # are queued and the store's current articles are returned
+            stale += missing
+            missing = []
+        if missing:
+            self.refresh(limit, missing)
+        if stale:
+            # Serve stale data now and revalidate in the background
+            self._refresh_async(limit, stale)
+        
+        with self._lock:
+            per_feed = [
+                self._feeds[feed_url]['articles'][:limit]
+                for feed_url in feeds if feed_url in self._feeds
+            ]
+            return merge_articles(per_feed, total_limit)
+        
+    def get_feed_articles(self, feed_url: str) -> List[Article]:
+        """Get the stored articles of a single feed"""
+        with self._lock:
+            snapshot = self._feeds.get(feed_url)
+            return list(snapshot['articles']) if snapshot else []
+    
+    def refresh(self, limit: int = 20, feeds: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Fetch feeds and store their articles
+        
+        A feed that fails keeps its previous articles; the attempt still counts
+        towards freshness so a dead feed is not retried inline on every read.
+        
+        Args:
+            limit: Maximum number of articles per feed
+            feeds: Feed URLs to refresh (defaults to all configured feeds)
+        
+        Returns:
+            Per-feed fetch report (see NewsFetcher.fetch_with_report)
+        """
+        with self._lock:
+            generation = self._generation
+        
+        articles, report = self.fetcher.fetch_with_report(limit=limit, feeds=feeds)
+        
+        by_feed: Dict[str, List[Article]] = {}
+        for article in articles:
+            by_feed.setdefault(article.source, []).append(article)
+        # Stored newest first so readers can merge without re-sorting
+        for feed_articles in by_feed.values():
+            feed_articles.sort(key=lambda x: x.published_ts, reverse=True)
+        # Count words now so ranking the stored articles doesn't have to
+        term_counts.add(articles)
+        
+        now = time.time()
+        with self._lock:
+            # A refresh that started before invalidate() must not repopulate what it dropped
+            if generation < self._cleared_at:
+                return report
+            
+            for feed_url, status in report.items():
+                if self._dropped_at.get(feed_url, 0) > generation:
+                    continue
+                snapshot = self._feeds.setdefault(feed_url, {'articles': [], 'updated_at': None})
+                snapshot['checked_at'] = now
+                snapshot['limit'] = limit
+                snapshot['status'] = status
+                if status['status'] == 'ok':
+                    snapshot['articles'] = by_feed.get(feed_url, [])
+                    snapshot['updated_at'] = now
+        
+        self._save_data()
+        return report
+    
+    def invalidate(self, feeds: Optional[Iterable[str]] = None):
+        """
+        Drop stored articles (e.g. of feeds removed from the feed list)
+        
+        Args:
+            feeds: Feed URLs to drop (defaults to every feed)
+        """
+        with self._lock:
+            self._generation += 1
+            if feeds is None:
+                self._feeds.clear()
+                self._cleared_at = self._generation
+            else:
+                for feed_url in feeds:
+                    self._feeds.pop(feed_url, None)
+                    self._dropped_at[feed_url] = self._generation
+        self._save_data()
+        logger.info("Article cache invalidated" if feeds is None else "Article cache invalidated for removed feeds")
+    
+    def get_feed_status(self, feeds: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Per-feed status of the stored articles
+        
+        Args:
+            feeds: Feed URLs (defaults to all configured feeds)
+        
+        Returns:
+            Dict mapping each feed URL to the report of its last refresh (see
+            NewsFetcher.fetch_with_report) with the number of stored articles
+            and their age in seconds; feeds not stored yet are 'pending'
+        """
+        feeds = list(feeds if feeds is not None else self.fetcher.rss_feeds)
+        with self._lock:
+            now = time.time()
+            status = {}
+            for feed_url in feeds:
+                snapshot = self._feeds.get(feed_url)
+                if not snapshot:
+                    status[feed_url] = {'status': 'pending', 'stored': 0, 'age': None,
+                                        'refreshing': feed_url in self._refreshing}
+                    continue
+                status[feed_url] = dict(snapshot.get('status') or {'status': 'ok'},
+                                        stored=len(snapshot['articles']),
+                                        age=round(now - snapshot['checked_at'], 1),
+                                        refreshing=feed_url in self._refreshing)
+            return status
+    
+    def get_stats(self) -> Dict:
+        """Get store size and per-feed ages"""
+        with self._lock:
+            now = time.time()
+            return {
+                'feeds': len(self._feeds),
+                'articles': sum(len(snapshot['articles']) for snapshot in self._feeds.values()),
+                'ttl': self.ttl,
+                'ages': {
+                    feed_url: round(now - snapshot['checked_at'], 1)
+                    for feed_url, snapshot in self._feeds.items()
+                },
+                'refreshing': len(self._refreshing)
+            }
+    
+    def _refresh_async(self, limit: int, feeds: List[str]):
+        """Start a background refresh for feeds not already being refreshed"""
+        with self._lock:
+            feeds = [feed_url for feed_url in feeds if feed_url not in self._refreshing]
+            if not feeds:
+                return
+            self._refreshing.update(feeds)
+        
+        def run():
+            try:
+                self.refresh(limit, feeds)
+            except Exception as e:
+                logger.error(f"Background article refresh failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(feeds)
+        
+        threading.Thread(target=run, name="article-cache-refresh", daemon=True).start()
@@ -0,0 +1,169 @@
+"""
+Twitter News Curator - Article Index Module
+Persistent URL/ID-keyed index of every article seen, with LRU eviction
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Union
+from pathlib import Path
+
+from article import Article
+from url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+def article_id(url: str) -> str:
+    """Stable short ID for an article, derived from its canonical URL"""
+    return hashlib.sha1(canonicalize_url(url).encode('utf-8')).hexdigest()[:16]
+
+
+class ArticleIndex:
+    """
+    Resolves articles by URL or ID in O(1) without network access
+    
+    The index file is read on first use, so a fetch with nothing new never loads it.
+    """
+    
+    def __init__(self, index_file: str = "data/article_index.json", max_size: int = 5000):
+        """
+        Initialize ArticleIndex
+        
+        Args:
+            index_file: Path to JSON file persisting the index
+            max_size: Maximum number of articles kept (least recently used are evicted)
+        """
+        self.index_file = Path(index_file)
+        self.max_size = max_size
+        
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._articles: "OrderedDict[str, Article]" = OrderedDict()
+        self._by_url: Dict[str, str] = {}
+        self._loaded = False
+    
+    def _ensure_loaded(self):
+        """Load the index file on first use (caller holds the lock)"""
+        if not self._loaded:
+            self._loaded = True
+            self._load_data()
+            logger.info(f"Loaded {len(self._articles)} articles into index")
+    
+    def _load_data(self):
+        """Load indexed articles from JSON file"""
+        if not self.index_file.exists():
+            return
+        
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                articles = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading article index: {e}")
+            return
+        
+        # File is written oldest-first, so re-adding preserves LRU order
+        for article in articles:
+            self._insert(article)
+        self._dirty = False
+    
+    def save(self):
+        """Write the index to disk if it changed (atomic replace)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps([article.to_dict() for article in self._articles.values()],
+                                  ensure_ascii=False)
+            self._dirty = False
+        
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving article index: {e}")
+    
+    def _insert(self, article: Union[Article, Dict]) -> str:
+        """Insert or refresh an article (caller holds the lock)"""
+        article = Article.from_dict(article)
+        if not article.id:
+            article.id = article_id(article.url_key)
+        key = article.id
+        
+        if self._articles.get(key) != article:
+            self._articles[key] = article
+            self._dirty = True
+        self._articles.move_to_end(key)
+        self._by_url[article.url_key] = key
+        
+        while len(self._articles) > self.max_size:
+            _, evicted = self._articles.popitem(last=False)
+            self._by_url.pop(evicted.url_key, None)
+            self._dirty = True
+        
+        return key
+    
+    def add(self, article: Union[Article, Dict]) -> str:
+        """
+        Add or update an article
+        
+        Args:
+            article: Article (or article dictionary with at least title and link)
+        
+        Returns:
+            The article's stable ID
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._insert(article)
+    
+    def add_many(self, articles: Iterable[Union[Article, Dict]]):
+        """Add or update several articles at once"""
+        with self._lock:
+            self._ensure_loaded()
+            for article in articles:
+                self._insert(article)
+    
+    def get(self, key: str) -> Optional[Article]:
+        """
+        Get an article by its stable ID
+        
+        Args:
+            key: Article ID
+        
+        Returns:
+            Article or None if not indexed
+        """
+        with self._lock:
+            self._ensure_loaded()
+            article = self._articles.get(key)
+            if article is None:
+                return None
+            self._articles.move_to_end(key)
+            return article
+    
+    def get_by_url(self, url: str) -> Optional[Article]:
+        """
+        Get an article by URL
+        
+        Args:
+            url: Article URL (any variant with the same canonical form)
+        
+        Returns:
+            Article or None if not indexed
+        """
+        with self._lock:
+            self._ensure_loaded()
+            key = self._by_url.get(canonicalize_url(url))
+        return self.get(key) if key else None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._articles)
@@ -3,55 +3,236 @@ Twitter News Curator - Article Tracker Module
 Tracks posted articles to prevent duplicates
 """
 
-import json
+import atexit
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from bloom_filter import BloomFilter
+from tracker_storage import JsonStorage, TrackerStorage, create_storage
+from url_utils import URL_RULES_VERSION, canonicalize_url, url_key
+
 logger = logging.getLogger(__name__)
 
 
 class ArticleTracker:
     """Tracks posted articles to prevent duplicate tweets"""
     
-    def __init__(self, data_file: str = "data/posted_articles.json"):
+    def __init__(self, data_file: str = "data/posted_articles.json", fsync: str = 'interval',
+                 fsync_interval: float = 1.0, compact_every: int = 500,
+                 storage: Optional[TrackerStorage] = None, seen_filter: Optional[Dict] = None,
+                 write_behind: Optional[Dict] = None, max_history: Optional[int] = None,
+                 max_age_days: Optional[float] = None):
         """
         Initialize ArticleTracker
         
+        By default posts are appended to a journal next to data_file (one
+        line per change) and periodically compacted into data_file itself.
+        
+        Every mark_as_posted() is written before it returns, unless it runs
+        inside batch() (written when the block exits) or write_behind is set
+        (buffered and written by a background thread every flush_interval
+        seconds, once max_pending posts are waiting, and on close() or
+        interpreter exit). Buffered posts count as posted in this process
+        straight away, but a crash loses them and other processes don't see
+        them until they are flushed.
+        
+        Articles are keyed by canonical URL (see url_utils), so tracking
+        parameters or http/https variants of a posted link still match. A
+        history stored under older rules is re-keyed once on startup. Each
+        post also records the article's story_id (see story_index), and
+        posted_links() treats every report of a posted story as posted.
+        
+        Retention is enforced as posts are written: the oldest entries past
+        max_history, or older than max_age_days, are evicted right away.
+        
         Args:
-            data_file: Path to JSON file storing posted articles
+            data_file: Path to JSON snapshot of posted articles
+            fsync: Journal fsync policy: 'always', 'interval' or 'never'
+            fsync_interval: Seconds between fsyncs for the 'interval' policy
+            compact_every: Journal entries that trigger a background compaction
+            storage: Storage backend to use instead of the JSON journal
+            seen_filter: Bloom filter settings (file, capacity, error_rate,
+                max_bytes, save_every); None to query the storage directly
+            write_behind: Write-behind buffer settings (max_pending,
+                flush_interval); None to write every post immediately
+            max_history: Number of most recent posts to keep (None keeps all)
+            max_age_days: Forget posts older than this (None keeps all)
         """
         self.data_file = Path(data_file)
-        self.posted_articles = self._load_data()
-        logger.info(f"Loaded {len(self.posted_articles)} posted articles")
+        self.max_history = max_history
+        self.max_age = timedelta(days=max_age_days) if max_age_days else None
+        self.storage = storage or JsonStorage(data_file, fsync=fsync, fsync_interval=fsync_interval,
+                                              compact_every=compact_every)
+        
+        # Posts waiting to be written, keyed by URL (set up first: loading
+        # the seen filter and migrating URLs both read it)
+        self._pending: Dict[str, Dict] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._batch = threading.local()
+        self._closed = threading.Event()
+        self._flusher = None
+        self.max_pending = 0
+        
+        self.seen: Optional[BloomFilter] = None
+        self._seen_lock = threading.Lock()
+        if seen_filter is not None:
+            self._load_seen_filter(seen_filter)
+        
+        if self.storage.get_meta('url_rules') != str(URL_RULES_VERSION):
+            self._migrate_urls()
+        
+        self._enforce_retention()
+        logger.info(f"Loaded {self.storage.count()} posted articles ({type(self.storage).__name__})")
+        
+        if write_behind is not None:
+            self.max_pending = write_behind.get('max_pending', 100)
+            self.flush_interval = write_behind.get('flush_interval', 5.0)
+            self._flusher = threading.Thread(target=self._flush_periodically, name="tracker-write-behind",
+                                             daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
     
-    def _load_data(self) -> Dict:
-        """Load posted articles from JSON file"""
-        if not self.data_file.exists():
-            logger.info(f"Creating new tracking file: {self.data_file}")
-            self.data_file.parent.mkdir(parents=True, exist_ok=True)
-            return {}
+    @classmethod
+    def from_config(cls, config: Dict) -> "ArticleTracker":
+        """Build an ArticleTracker from the 'article_tracking' config section"""
+        settings = config.get('article_tracking', {})
+        seen_filter = settings.get('seen_filter', {})
+        write_behind = settings.get('write_behind', {})
+        return cls(
+            settings.get('data_file', 'data/posted_articles.json'),
+            storage=create_storage(settings),
+            seen_filter=seen_filter if seen_filter.get('enabled', False) else None,
+            write_behind=write_behind if write_behind.get('enabled', False) else None,
+            max_history=settings.get('max_history'),
+            max_age_days=settings.get('max_age_days')
+        )
+    
+    def _load_seen_filter(self, settings: Dict):
+        """Load the persisted Bloom filter and add posts stored after its position"""
+        self.seen_file = Path(settings.get('file', 'data/seen_urls.bloom'))
+        self.seen_capacity = settings.get('capacity', 1_000_000)
+        self.seen_error_rate = settings.get('error_rate', 0.001)
+        self.seen_max_bytes = settings.get('max_bytes')
+        self.seen_save_every = settings.get('save_every', 50)
         
-        try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
-        except json.JSONDecodeError as e:
-            logger.error(f"Error loading data file: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"Unexpected error loading data: {e}")
-            return {}
-    
-    def _save_data(self):
-        """Save posted articles to JSON file"""
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.posted_articles, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Saved {len(self.posted_articles)} articles to {self.data_file}")
-        except Exception as e:
-            logger.error(f"Error saving data file: {e}")
+        self.seen, self._seen_position = None, ''
+        if self.seen_file.exists():
+            try:
+                bloom, extra = BloomFilter.load(self.seen_file)
+                # A filter that was grown past the configured capacity is kept
+                if bloom.capacity >= self.seen_capacity:
+                    self.seen, self._seen_position = bloom, extra.decode('utf-8')
+                    self.seen_capacity = bloom.capacity
+            except (OSError, ValueError) as e:
+                logger.error(f"Error loading seen filter, rebuilding: {e}")
+        
+        if self.seen is None:
+            self.seen = BloomFilter(self.seen_capacity, self.seen_error_rate, self.seen_max_bytes)
+        
+        # Posts written after the filter was last saved (or all, when rebuilding)
+        self._seen_version = None
+        self._unsaved_seen = 0
+        if self._sync_seen():
+            self.save_seen_filter()
+        logger.info(f"Seen filter holds {len(self.seen)} URLs ({len(self.seen.bits) / 1024:.0f} KB)")
+        
+        if self.seen.is_full:
+            self._rebuild_seen_filter()
+    
+    def _sync_seen(self) -> int:
+        """
+        Add posts other processes stored since the last sync to the filter
+        
+        The position is the storage's own write order (journal offset or
+        SQLite sequence number), not posted_at, so imported or re-keyed posts
+        with old timestamps are picked up too. It only advances here, from the
+        storage itself, so a saved filter always holds every post stored up to
+        its position. A position the storage doesn't recognize (a compacted
+        journal, another backend) means reading every stored URL once.
+        
+        Returns:
+            Number of URLs read from the storage (0 if it had not changed)
+        """
+        version = self.storage.version()
+        if version == self._seen_version:
+            return 0
+        
+        added = 0
+        with self._seen_lock:
+            urls, position = self.storage.changes_since(self._seen_position)
+            for url in urls:
+                self.seen.add(url)
+                added += 1
+            self._seen_position = position
+            self._seen_version = version
+        return added
+    
+    def _migrate_urls(self) -> int:
+        """
+        Re-key posts stored under non-canonical URLs
+        
+        When several stored URLs share a canonical form, the earliest post
+        is kept.
+        
+        Returns:
+            Number of posts re-keyed
+        """
+        renamed = {}
+        for url, _ in self.storage.urls_since(''):
+            canonical = canonicalize_url(url)
+            if canonical != url:
+                renamed[url] = canonical
+        
+        if renamed:
+            records: Dict[str, Dict] = {}
+            for url, canonical in renamed.items():
+                record = self.storage.get(url)
+                existing = records.get(canonical) or self.storage.get(canonical)
+                if record and (existing is None or record.get('posted_at', '') < existing.get('posted_at', '')):
+                    records[canonical] = record
+            
+            if self.seen is not None:
+                with self._seen_lock:
+                    self.seen.update(records)
+                self.save_seen_filter()
+            self.storage.put_many(records.items())
+            self.storage.delete_many(renamed)
+            logger.info(f"Re-keyed {len(renamed)} posted articles by canonical URL")
+        
+        self.storage.set_meta('url_rules', str(URL_RULES_VERSION))
+        return len(renamed)
+    
+    def _rebuild_seen_filter(self):
+        """Resize a filter that outgrew its capacity (false positives climb past it)"""
+        self.seen_capacity *= 2
+        logger.warning(f"Seen filter over capacity, rebuilding for {self.seen_capacity} URLs "
+                       f"(raise seen_filter.capacity to avoid this)")
+        with self._seen_lock:
+            self.seen, self._seen_position = BloomFilter(
+                self.seen_capacity, self.seen_error_rate, self.seen_max_bytes
+            ), ''
+            self._seen_version = None
+        self._sync_seen()
+        # Buffered posts aren't in the storage yet
+        with self._pending_lock, self._seen_lock:
+            self.seen.update(self._pending)
+        self.save_seen_filter()
+    
+    def save_seen_filter(self):
+        """Persist the Bloom filter with its storage position (no-op if disabled)"""
+        if self.seen is None:
+            return
+        with self._seen_lock:
+            try:
+                self.seen.save(self.seen_file, self._seen_position.encode('utf-8'))
+                self._unsaved_seen = 0
+            except OSError as e:
+                logger.error(f"Error saving seen filter: {e}")
     
     def has_been_posted(self, article_url: str) -> bool:
         """
@@ -63,35 +244,222 @@ class ArticleTracker:
         Returns:
             True if article has been posted, False otherwise
         """
-        return article_url in self.posted_articles
+        article_url = canonicalize_url(article_url)
+        if article_url in self._pending:
+            return True
+        # A filter miss is definitive once the filter has caught up with
+        # posts from other processes; only possible hits reach the storage
+        if self.seen is not None and article_url not in self.seen:
+            self._sync_seen()
+            if article_url not in self.seen:
+                return False
+        return self.storage.contains(article_url)
+    
+    def posted_urls(self, article_urls: Iterable[str]) -> Set[str]:
+        """
+        Batch check which URLs have already been posted
+        
+        Args:
+            article_urls: URLs to check (e.g. a whole fetched page)
+        
+        Returns:
+            Set of the URLs (as given) that have been posted
+        """
+        canonical = {url: canonicalize_url(url) for url in article_urls}
+        candidates = set(canonical.values())
+        posted = {url for url in candidates if url in self._pending}
+        if self.seen is not None:
+            self._sync_seen()
+            candidates = [url for url in candidates if url in self.seen]
+        posted |= self.storage.contains_many(candidates)
+        return {url for url, key in canonical.items() if key in posted}
+    
+    def posted_stories(self, story_ids: Iterable[str]) -> Set[str]:
+        """
+        Batch check which stories have a posted article
+        
+        Args:
+            story_ids: Story IDs to check
+        
+        Returns:
+            Set of the story IDs that have been posted
+        """
+        story_ids = {story_id for story_id in story_ids if story_id}
+        if not story_ids:
+            return set()
+        with self._pending_lock:
+            posted = {record['story_id'] for record in self._pending.values()
+                      if record.get('story_id') in story_ids}
+        return posted | self.storage.contains_stories(story_ids - posted)
+    
+    def posted_links(self, articles: Iterable[Dict]) -> Set[str]:
+        """
+        Links of the articles that were posted, or whose story was
+        
+        Args:
+            articles: Articles with link and story_id (e.g. a whole fetched page)
+        
+        Returns:
+            Set of the article links (as given) to treat as posted
+        """
+        articles = list(articles)
+        posted = self.posted_urls(url_key(article) for article in articles)
+        stories = self.posted_stories(article.get('story_id') for article in articles)
+        return {article['link'] for article in articles
+                if url_key(article) in posted or article.get('story_id') in stories}
     
-    def mark_as_posted(self, article: Dict, tweet_id: Optional[str] = None):
+    def mark_as_posted(self, article: Dict, tweet_id: Optional[str] = None, tweet_text: Optional[str] = None):
         """
         Mark an article as posted
         
         Args:
             article: Article dictionary with title, link, etc.
             tweet_id: Twitter/X tweet ID (if posted)
+            tweet_text: Text of the posted tweet (see recent_tweets)
         """
-        article_url = article.get('link', '')
+        article_url = url_key(article)
         
         if not article_url:
             logger.warning("Cannot mark article without URL")
             return
         
-        self.posted_articles[article_url] = {
+        self._store([(article_url, {
             'title': article.get('title', ''),
             'posted_at': datetime.now().isoformat(),
             'tweet_id': tweet_id,
-            'source': article.get('source', '')
-        }
+            'source': article.get('source', ''),
+            'story_id': article.get('story_id') or '',
+            'tweet_text': tweet_text or ''
+        })])
         
-        self._save_data()
         logger.info(f"Marked as posted: {article.get('title', '')[:50]}...")
     
+    def mark_many(self, articles: Iterable[Dict]) -> int:
+        """
+        Mark many articles as posted with a single storage write
+        
+        Meant for bulk operations such as importing an older history. Each
+        article may carry its own 'tweet_id', 'tweet_text' and 'posted_at'
+        (ISO string); posted_at defaults to now.
+        
+        Args:
+            articles: Article dictionaries with title, link, etc.
+        
+        Returns:
+            Number of articles marked
+        """
+        now = datetime.now().isoformat()
+        items = [
+            (url_key(article), {
+                'title': article.get('title', ''),
+                'posted_at': article.get('posted_at') or now,
+                'tweet_id': article.get('tweet_id'),
+                'source': article.get('source', ''),
+                'story_id': article.get('story_id') or '',
+                'tweet_text': article.get('tweet_text') or ''
+            })
+            for article in articles if article.get('link')
+        ]
+        self._store(items)
+        logger.info(f"Marked {len(items)} articles as posted")
+        return len(items)
+    
+    def _store(self, items: List[Tuple[str, Dict]]):
+        """Write (url, record) pairs now, or buffer them in write-behind mode or inside batch()"""
+        if not items:
+            return
+        
+        # Filter first: a filter hit without a stored record is harmless,
+        # a stored record missing from the filter would be a duplicate tweet
+        if self.seen is not None:
+            with self._seen_lock:
+                self.seen.update(url for url, _ in items)
+        
+        if self.max_pending or getattr(self._batch, 'depth', 0):
+            with self._pending_lock:
+                self._pending.update(items)
+                flush = (self.max_pending and len(self._pending) >= self.max_pending
+                         and not getattr(self._batch, 'depth', 0))
+            if flush:
+                self.flush()
+        else:
+            self.storage.put_many(items)
+            self._enforce_retention()
+        
+        if self.seen is not None:
+            self._unsaved_seen += len(items)
+            if self.seen.is_full:
+                self._rebuild_seen_filter()
+            elif self._unsaved_seen >= self.seen_save_every:
+                self.save_seen_filter()
+        
+    @contextmanager
+    def batch(self):
+        """
+        Collect the posts marked inside the block and write them together
+        
+        Posts marked in the block are written when it exits, even if it
+        raises: they were already posted. Blocks can be nested; the outermost
+        one writes.
+        
+        Usage:
+            with tracker.batch():
+                for article, tweet_id in posted:
+                    tracker.mark_as_posted(article, tweet_id)
+        """
+        self._batch.depth = getattr(self._batch, 'depth', 0) + 1
+        try:
+            yield self
+        finally:
+            self._batch.depth -= 1
+            if self._batch.depth == 0:
+                self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write buffered posts to the storage
+        
+        Returns:
+            Number of posts written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                items = list(self._pending.items())
+            if not items:
+                return 0
+            
+            self.storage.put_many(items)
+            self._enforce_retention()
+            # Keep posts visible as pending until they are stored
+            with self._pending_lock:
+                for url, record in items:
+                    if self._pending.get(url) is record:
+                        del self._pending[url]
+        
+        logger.debug(f"Flushed {len(items)} posted articles")
+        return len(items)
+    
+    def _enforce_retention(self) -> int:
+        """Evict entries beyond max_history or older than max_age_days"""
+        if self.max_history is None and self.max_age is None:
+            return 0
+        before = (datetime.now() - self.max_age).isoformat() if self.max_age else None
+        removed = self.storage.evict(self.max_history, before)
+        if removed:
+            logger.info(f"Retention removed {removed} old entries")
+        return removed
+    
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing posted articles: {e}")
+    
     def get_posted_count(self) -> int:
         """Get total number of posted articles"""
-        return len(self.posted_articles)
+        self.flush()
+        return self.storage.count()
     
     def get_recent_posts(self, limit: int = 10) -> List[Dict]:
         """
@@ -101,50 +469,62 @@ class ArticleTracker:
             limit: Maximum number of articles to return
             
         Returns:
-            List of recently posted articles
+            List of recently posted articles, newest first
         """
-        # Sort by posted_at date
-        sorted_articles = sorted(
-            self.posted_articles.items(),
-            key=lambda x: x[1].get('posted_at', ''),
-            reverse=True
-        )
+        self.flush()
+        return self.storage.recent(limit)
+    
+    def recent_tweets(self, limit: int = 20) -> List[str]:
+        """
+        Get the text of recently posted tweets, newest first
         
-        return [
-            {'url': url, **data}
-            for url, data in sorted_articles[:limit]
-        ]
+        Posts recorded without their text (older history, auto-post skips)
+        are left out.
+        """
+        return [post['tweet_text'] for post in self.get_recent_posts(limit) if post.get('tweet_text')]
     
-    def cleanup_old_entries(self, max_entries: int = 1000):
+    def cleanup_old_entries(self, max_entries: Optional[int] = None):
         """
         Remove oldest entries if tracking file gets too large
         
+        Retention runs on every write, so this is only needed to apply a
+        tighter limit once.
+        
         Args:
-            max_entries: Maximum number of entries to keep
+            max_entries: Maximum number of entries to keep (defaults to
+                max_history, or 1000)
         """
-        if len(self.posted_articles) <= max_entries:
-            return
-        
-        logger.info(f"Cleaning up old entries (keeping {max_entries} most recent)")
-        
-        # Sort by posted_at date
-        sorted_articles = sorted(
-            self.posted_articles.items(),
-            key=lambda x: x[1].get('posted_at', ''),
-            reverse=True
-        )
-        
-        # Keep only the most recent entries
-        self.posted_articles = dict(sorted_articles[:max_entries])
-        self._save_data()
-        
-        logger.info(f"Cleanup complete. Now tracking {len(self.posted_articles)} articles")
+        self.flush()
+        if max_entries is None:
+            max_entries = self.max_history if self.max_history is not None else 1000
+        removed = self.storage.trim(max_entries)
+        if removed:
+            logger.info(f"Cleanup complete. Removed {removed} old entries, "
+                        f"now tracking {self.storage.count()} articles")
     
     def clear_all(self):
         """Clear all tracked articles (use with caution!)"""
         logger.warning("Clearing all tracked articles")
-        self.posted_articles = {}
-        self._save_data()
+        with self._pending_lock:
+            self._pending.clear()
+        self.storage.clear()
+        if self.seen is not None:
+            with self._seen_lock:
+                self.seen, self._seen_position = BloomFilter(
+                    self.seen_capacity, self.seen_error_rate, self.seen_max_bytes
+                ), ''
+                self._seen_version = None
+            self.save_seen_filter()
+    
+    def close(self):
+        """Flush pending writes and close the storage"""
+        self._closed.set()
+        if self._flusher:
+            self._flusher.join()
+            atexit.unregister(self.flush)
+        self.flush()
+        self.save_seen_filter()
+        self.storage.close()
 
 
 if __name__ == "__main__":
@@ -174,3 +554,49 @@ if __name__ == "__main__":
     print("\nRecent posts:")
     for post in tracker.get_recent_posts(limit=5):
         print(f"  - {post['title']}")
+
+    # Benchmark: importing a 50k-post history, one call per post vs mark_many
+    import tempfile
+    import time
+    from tracker_storage import SQLiteStorage
+    
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    history = [
+        {'title': f"Article {i}", 'link': f"https://example.com/{i}", 'tweet_id': str(i),
+         'posted_at': (datetime(2024, 1, 1) + timedelta(minutes=i)).isoformat(),
+         'source': 'https://example.com/rss'}
+        for i in range(50_000)
+    ]
+    
+    print(f"\n📥 Importing {len(history):,} posts")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_storage in (
+            ("json", lambda label: JsonStorage(Path(tmp) / f"{label}.json", fsync='always')),
+            ("sqlite", lambda label: SQLiteStorage(Path(tmp) / f"{label}.db")),
+        ):
+            single = ArticleTracker(storage=make_storage("single"))
+            started = time.perf_counter()
+            for article in history[:500]:
+                single.mark_as_posted(article, article['tweet_id'])
+            one_by_one = (time.perf_counter() - started) / 500 * len(history)
+            single.close()
+            
+            bulk = ArticleTracker(storage=make_storage("bulk"))
+            started = time.perf_counter()
+            bulk.mark_many(history)
+            many = time.perf_counter() - started
+            assert bulk.get_posted_count() == len(history)
+            bulk.close()
+            
+            buffered = ArticleTracker(storage=make_storage("buffered"),
+                                      write_behind={'max_pending': 1000, 'flush_interval': 5.0})
+            started = time.perf_counter()
+            for article in history:
+                buffered.mark_as_posted(article, article['tweet_id'])
+            buffered.close()
+            write_behind = time.perf_counter() - started
+            
+            print(f"   {name:6s}  one by one ~{one_by_one:7.1f} s   mark_many {many:5.2f} s   "
+                  f"write-behind {write_behind:5.2f} s")
+    print()
@@ -0,0 +1,173 @@
+"""
+Twitter News Curator - Bloom Filter Module
+Compact probabilistic set of seen URLs, persisted to disk
+"""
+
+import hashlib
+import logging
+import math
+import os
+import struct
+from typing import Iterable, List, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# magic, version, bit count, hash count, capacity, item count
+HEADER = struct.Struct('<4sBQBQQ')
+MAGIC = b'BLM1'
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings
+    
+    Never reports a false negative; reports a false positive with roughly
+    `error_rate` probability while it holds no more than `capacity` items.
+    """
+    
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize BloomFilter
+        
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false-positive rate at capacity
+            max_bytes: Memory budget; if the target needs more, the filter is
+                capped and the false-positive rate rises accordingly
+        """
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes is not None and bits > max_bytes * 8:
+            bits = max_bytes * 8
+            logger.warning(f"Bloom filter capped at {max_bytes} bytes; expected false-positive "
+                           f"rate at capacity is {self._error_rate(bits, capacity):.4f}")
+        
+        self.capacity = capacity
+        self.num_bits = max(bits, 8)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    @staticmethod
+    def _error_rate(bits: int, capacity: int) -> float:
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return (1 - math.exp(-hashes * capacity / bits)) ** hashes
+    
+    def _positions(self, item: str) -> List[int]:
+        """Bit positions for an item (Kirsch-Mitzenmacher double hashing)"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, item: str) -> bool:
+        """
+        Add an item
+        
+        Returns:
+            True if the item was (probably) new
+        """
+        new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+    
+    def update(self, items: Iterable[str]):
+        for item in items:
+            self.add(item)
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def __len__(self) -> int:
+        """Approximate number of distinct items added"""
+        return self.count
+    
+    @property
+    def is_full(self) -> bool:
+        return self.count > self.capacity
+    
+    def save(self, path: str, extra: bytes = b''):
+        """
+        Write the filter to disk (atomic replace)
+        
+        Args:
+            path: Destination file
+            extra: Opaque trailer stored after the bit array (e.g. a storage position)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, 1, self.num_bits, self.num_hashes, self.capacity, self.count))
+            f.write(self.bits)
+            f.write(extra)
+        os.replace(tmp_file, path)
+    
+    @classmethod
+    def load(cls, path: str):
+        """
+        Read a filter written by save()
+        
+        Returns:
+            Tuple of (BloomFilter, extra bytes)
+        
+        Raises:
+            ValueError: If the file is not a valid filter
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        if len(data) < HEADER.size:
+            raise ValueError("truncated bloom filter file")
+        magic, version, num_bits, num_hashes, capacity, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != 1:
+            raise ValueError("not a bloom filter file")
+        
+        size = (num_bits + 7) // 8
+        if len(data) < HEADER.size + size:
+            raise ValueError("truncated bloom filter file")
+        
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bytearray(data[HEADER.size:HEADER.size + size])
+        bloom.count = count
+        return bloom, data[HEADER.size + size:]
+
+
+if __name__ == "__main__":
+    # Benchmark: size, false-positive rate and lookup cost for a million URLs
+    import tempfile
+    import time
+    
+    count = 1_000_000
+    bloom = BloomFilter(capacity=count, error_rate=0.001)
+    started = time.perf_counter()
+    bloom.update(f"https://example.com/news/{i}" for i in range(count))
+    build = time.perf_counter() - started
+    
+    probes = [f"https://example.org/other/{i}" for i in range(100_000)]
+    started = time.perf_counter()
+    false_positives = sum(1 for url in probes if url in bloom)
+    lookup = (time.perf_counter() - started) / len(probes)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "seen.bloom"
+        bloom.save(path, b'2025-01-06T10:00:00')
+        started = time.perf_counter()
+        BloomFilter.load(path)
+        load = time.perf_counter() - started
+    
+    print(f"\n🌸 Bloom filter with {count:,} URLs")
+    print(f"   size           {len(bloom.bits) / 1024 / 1024:.2f} MB ({bloom.num_hashes} hashes)")
+    print(f"   false positive {false_positives / len(probes):.4%} (target 0.1%)")
+    print(f"   lookup         {lookup * 1e6:.1f} µs")
+    print(f"   build          {build:.1f} s, load from disk {load * 1000:.1f} ms\n")
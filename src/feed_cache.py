@@ -0,0 +1,187 @@
+"""
+Twitter News Curator - Feed Cache Module
+Persists HTTP validators so unchanged feeds are not re-downloaded or re-parsed
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from pathlib import Path
+
+from article import Article, article_to_json
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """Per-feed ETag / Last-Modified / content-hash cache with hit and miss counters"""
+    
+    def __init__(self, cache_file: str = "data/feed_cache.json"):
+        """
+        Initialize FeedCache
+        
+        Args:
+            cache_file: Path to JSON file storing feed validators and parsed articles
+        """
+        self.cache_file = Path(cache_file)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = self._load_data()
+        logger.info(f"Loaded validator cache for {len(self.entries)} feeds")
+    
+    def _load_data(self) -> Dict:
+        """Load cached validators from JSON file"""
+        if not self.cache_file.exists():
+            return {}
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading feed cache: {e}")
+            return {}
+        
+        # Articles cached before publish times were stored as epochs can't be
+        # merged by date - forget them (and their validators) so they're refetched
+        for entry in data.values():
+            if any('published_ts' not in article for article in entry.get('articles', [])):
+                for key in ('articles', 'etag', 'last_modified', 'content_hash', 'limit'):
+                    entry.pop(key, None)
+            elif 'articles' in entry:
+                entry['articles'] = [Article.from_dict(article) for article in entry['articles']]
+        
+        return data
+    
+    def save(self):
+        """Write the cache to disk if it changed (atomic replace)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self.entries, ensure_ascii=False, default=article_to_json)
+            self._dirty = False
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving feed cache: {e}")
+    
+    def lookup(self, feed_url: str, limit: int) -> Optional[Dict]:
+        """
+        Get the cached entry for a feed if it can serve a request for `limit` articles
+        
+        Args:
+            feed_url: RSS feed URL
+            limit: Number of articles the caller wants from this feed
+        
+        Returns:
+            Cache entry dictionary or None
+        """
+        with self._lock:
+            entry = self.entries.get(feed_url)
+            if not entry or entry.get('limit', 0) < limit:
+                return None
+            return dict(entry)
+    
+    def high_water(self, feed_url: str) -> Optional[Dict]:
+        """
+        Get a feed's high-water mark: the newest entry seen by any earlier fetch
+        
+        Args:
+            feed_url: RSS feed URL
+        
+        Returns:
+            Dict with guid (entry key of the top entry), published_ts (newest
+            publish time seen) and ordered (whether the feed lists newest
+            first), or None if the feed was never fetched
+        """
+        with self._lock:
+            mark = self.entries.get(feed_url, {}).get('high_water')
+            return dict(mark) if mark else None
+    
+    def request_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build conditional request headers from a cache entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def record_hit(self, feed_url: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Count a cache hit (304 or unchanged body)
+        
+        Args:
+            feed_url: RSS feed URL
+            etag: Refreshed ETag from the response, if any
+            last_modified: Refreshed Last-Modified from the response, if any
+        """
+        with self._lock:
+            entry = self.entries.setdefault(feed_url, {})
+            entry['hits'] = entry.get('hits', 0) + 1
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+            entry['checked_at'] = time.time()
+            self._dirty = True
+    
+    def store(self, feed_url: str, articles: List[Article], limit: int, content_hash: str,
+              etag: Optional[str] = None, last_modified: Optional[str] = None,
+              high_water: Optional[Dict] = None):
+        """
+        Store freshly parsed articles and validators for a feed (counts a miss)
+        
+        Args:
+            feed_url: RSS feed URL
+            articles: Parsed articles
+            limit: Per-feed limit the articles were parsed with
+            content_hash: Hash of the raw feed body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            high_water: New high-water mark (see high_water), if it moved
+        """
+        with self._lock:
+            entry = self.entries.setdefault(feed_url, {})
+            entry.update({
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_hash': content_hash,
+                'limit': limit,
+                'articles': articles,
+                'checked_at': time.time()
+            })
+            if high_water:
+                entry['high_water'] = high_water
+            entry['misses'] = entry.get('misses', 0) + 1
+            self._dirty = True
+    
+    def invalidate(self, feed_url: Optional[str] = None):
+        """Drop cached data for one feed, or for all feeds"""
+        with self._lock:
+            if feed_url is None:
+                self.entries = {}
+            else:
+                self.entries.pop(feed_url, None)
+            self._dirty = True
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        """Get hit/miss counts for each cached feed"""
+        with self._lock:
+            return {
+                url: {
+                    'hits': entry.get('hits', 0),
+                    'misses': entry.get('misses', 0),
+                    'etag': bool(entry.get('etag')),
+                    'last_modified': bool(entry.get('last_modified'))
+                }
+                for url, entry in self.entries.items()
+            }
@@ -0,0 +1,173 @@
+"""
+Twitter News Curator - Feed Health Module
+Rolling latency/error tracking and a circuit breaker for each RSS source
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class FeedHealth:
+    """Tracks per-feed health and stops calling feeds that keep failing"""
+    
+    def __init__(self, window: int = 50, failure_threshold: int = 3,
+                 cooldown: float = 300, max_cooldown: float = 3600):
+        """
+        Initialize FeedHealth
+        
+        Args:
+            window: Number of recent fetches used for latency and error rate
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds an open circuit waits before a half-open probe
+            max_cooldown: Upper bound for the cooldown, which doubles each
+                time a probe fails
+        """
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict] = {}
+    
+    def _state(self, feed_url: str) -> Dict:
+        """Get or create the state for a feed (caller holds the lock)"""
+        state = self._feeds.get(feed_url)
+        if state is None:
+            state = self._feeds[feed_url] = {
+                'circuit': CLOSED,
+                'results': deque(maxlen=self.window),
+                'consecutive_failures': 0,
+                'cooldown': self.cooldown,
+                'open_until': 0.0,
+                'probe_in_flight': False,
+                'last_error': None
+            }
+        return state
+    
+    def allow_request(self, feed_url: str) -> bool:
+        """
+        Check whether a feed may be fetched now
+        
+        An open circuit rejects requests until its cooldown expires, then
+        lets a single half-open probe through.
+        
+        Args:
+            feed_url: RSS feed URL
+        
+        Returns:
+            True if the feed should be fetched
+        """
+        with self._lock:
+            state = self._state(feed_url)
+            
+            if state['circuit'] == CLOSED:
+                return True
+            
+            if state['circuit'] == OPEN and time.time() >= state['open_until']:
+                state['circuit'] = HALF_OPEN
+                state['probe_in_flight'] = False
+                logger.info(f"Circuit half-open, probing feed: {feed_url}")
+            
+            if state['circuit'] == HALF_OPEN and not state['probe_in_flight']:
+                state['probe_in_flight'] = True
+                return True
+            
+            return False
+    
+    def record_success(self, feed_url: str, latency: float):
+        """Record a successful fetch and close the circuit"""
+        with self._lock:
+            state = self._state(feed_url)
+            state['results'].append((latency, True))
+            state['consecutive_failures'] = 0
+            state['probe_in_flight'] = False
+            
+            if state['circuit'] != CLOSED:
+                logger.info(f"Circuit closed, feed recovered: {feed_url}")
+            state['circuit'] = CLOSED
+            state['cooldown'] = self.cooldown
+    
+    def record_failure(self, feed_url: str, latency: float, error: Optional[str] = None):
+        """Record a failed or timed-out fetch, opening the circuit if needed"""
+        with self._lock:
+            state = self._state(feed_url)
+            state['results'].append((latency, False))
+            state['consecutive_failures'] += 1
+            state['probe_in_flight'] = False
+            state['last_error'] = error
+            
+            if state['circuit'] == HALF_OPEN:
+                # Probe failed - stay away longer this time
+                state['cooldown'] = min(state['cooldown'] * 2, self.max_cooldown)
+                self._open(feed_url, state)
+            elif state['circuit'] == CLOSED and state['consecutive_failures'] >= self.failure_threshold:
+                self._open(feed_url, state)
+    
+    def _open(self, feed_url: str, state: Dict):
+        state['circuit'] = OPEN
+        state['open_until'] = time.time() + state['cooldown']
+        logger.warning(f"Circuit open for {state['cooldown']:.0f}s after "
+                       f"{state['consecutive_failures']} failures: {feed_url}")
+    
+    def reset(self, feed_url: Optional[str] = None):
+        """Forget health history for one feed, or for all feeds"""
+        with self._lock:
+            if feed_url is None:
+                self._feeds.clear()
+            else:
+                self._feeds.pop(feed_url, None)
+    
+    def get_health(self, feed_url: Optional[str] = None) -> Dict:
+        """
+        Get health metrics for one feed, or a dict of all feeds
+        
+        Metrics: circuit state, p50/p95 latency, error rate over the window,
+        and a 0-100 score combining error rate and p95 latency.
+        """
+        with self._lock:
+            if feed_url is not None:
+                return self._summary(self._state(feed_url))
+            return {url: self._summary(state) for url, state in self._feeds.items()}
+    
+    @staticmethod
+    def _summary(state: Dict) -> Dict:
+        results = list(state['results'])
+        latencies = [latency for latency, _ in results]
+        error_rate = sum(1 for _, ok in results if not ok) / len(results) if results else 0.0
+        p95 = percentile(latencies, 95)
+        
+        # Full marks under 2s p95, fading to zero at 20s; errors scale it down
+        latency_factor = 1.0 if p95 is None else max(0.0, min(1.0, (20 - p95) / 18))
+        score = round(100 * (1 - error_rate) * latency_factor) if results else None
+        
+        return {
+            'circuit': state['circuit'],
+            'p50': round(percentile(latencies, 50), 3) if latencies else None,
+            'p95': round(p95, 3) if p95 is not None else None,
+            'error_rate': round(error_rate, 3),
+            'samples': len(results),
+            'score': score,
+            'consecutive_failures': state['consecutive_failures'],
+            'last_error': state['last_error'],
+            'open_until': state['open_until'] if state['circuit'] != CLOSED else None
+        }
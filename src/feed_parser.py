@@ -0,0 +1,240 @@
+"""
+Twitter News Curator - Feed Parser Module
+Streaming RSS/Atom parser that stops reading after the entries we keep
+"""
+
+import io
+import logging
+import xml.etree.ElementTree as ET
+from itertools import islice, takewhile
+from typing import Dict, Iterator, List, Optional
+
+import feedparser
+from feedparser.datetimes import _parse_date as parse_feed_date
+
+logger = logging.getLogger(__name__)
+
+ENTRY_TAGS = {'item', 'entry'}
+FEED_TAGS = {'rss', 'feed', 'RDF'}
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(element) -> str:
+    """All text inside an element (Atom xhtml content has child elements)"""
+    return ''.join(element.itertext()).strip()
+
+
+def _entry_from_element(item) -> Dict:
+    """
+    Build a feedparser-style entry dict from an <item> or <entry> element
+    
+    Only the fields NewsFetcher reads are extracted: id, title, link,
+    feedburner_origlink, summary, published and published_parsed.
+    """
+    fields: Dict[str, str] = {}
+    link = None
+    guid = None
+    entry_id = None
+    
+    for child in item:
+        name = _local(child.tag)
+        
+        if name == 'link':
+            # RSS: <link>url</link>; Atom: <link rel="alternate" href="url"/>
+            href = child.get('href')
+            if href is None:
+                link = link or _text(child)
+            elif child.get('rel', 'alternate') == 'alternate':
+                link = link or href.strip()
+        elif name == 'guid':
+            entry_id = entry_id or _text(child)
+            if child.get('isPermaLink', 'true') != 'false':
+                guid = _text(child)
+        elif name == 'id':
+            entry_id = entry_id or _text(child)
+        elif name in ('title', 'description', 'summary', 'content', 'encoded', 'origLink',
+                      'pubDate', 'published', 'date', 'updated', 'issued', 'modified'):
+            fields.setdefault(name, _text(child))
+    
+    if not link and guid and guid.startswith('http'):
+        link = guid
+    
+    published = fields.get('pubDate') or fields.get('published') or fields.get('date') or fields.get('issued')
+    published_parsed = parse_feed_date(published) if published else None
+    updated = fields.get('updated') or fields.get('modified')
+    if published_parsed is None and updated:
+        published_parsed = parse_feed_date(updated)
+    
+    entry = {
+        'title': fields.get('title', ''),
+        'link': link or '',
+        'summary': (fields.get('description') or fields.get('summary')
+                    or fields.get('encoded') or fields.get('content') or ''),
+        'published_parsed': published_parsed
+    }
+    if entry_id:
+        entry['id'] = entry_id
+    if published:
+        entry['published'] = published
+    if fields.get('origLink'):
+        entry['feedburner_origlink'] = fields['origLink']
+    return entry
+
+
+def iter_entries(body: bytes) -> Iterator[Dict]:
+    """
+    Lazily yield entries of an RSS 2.0, RSS 1.0 or Atom document
+    
+    The document is read incrementally and each entry element is discarded
+    once converted, so only the entries actually consumed are ever built.
+    
+    Args:
+        body: Raw feed bytes
+    
+    Yields:
+        feedparser-style entry dicts
+    
+    Raises:
+        ET.ParseError: If the XML is malformed before the consumer stops
+        ValueError: If the document is not an RSS or Atom feed
+    """
+    depth = 0
+    for event, element in ET.iterparse(io.BytesIO(body), events=('start', 'end')):
+        if event == 'start':
+            if depth == 0 and _local(element.tag) not in FEED_TAGS:
+                raise ValueError(f"Not an RSS/Atom document: <{_local(element.tag)}>")
+            depth += 1
+            continue
+        
+        depth -= 1
+        if _local(element.tag) in ENTRY_TAGS:
+            yield _entry_from_element(element)
+            element.clear()
+
+
+def entry_key(entry) -> str:
+    """Stable identity of a feed entry: its GUID (RSS) or id (Atom), else its link"""
+    return entry.get('id') or entry.get('link') or ''
+
+
+def _head(entries, limit: int, stop_at: Optional[str]) -> List:
+    """First `limit` entries, ending before the entry whose key is stop_at"""
+    if stop_at:
+        entries = takewhile(lambda entry: entry_key(entry) != stop_at, entries)
+    return list(islice(entries, limit))
+
+
+def parse_entries(body: bytes, limit: int, stop_at: Optional[str] = None) -> Optional[List[Dict]]:
+    """
+    Parse the first `limit` entries of a feed with the streaming parser
+    
+    Args:
+        body: Raw feed bytes
+        limit: Number of entries to keep; nothing after them is read
+        stop_at: Entry key (see entry_key) to stop before, e.g. the newest
+            entry of the previous fetch; nothing after it is read either
+    
+    Returns:
+        List of entry dicts, or None if the streaming parser can't handle the
+        document (malformed XML, undeclared HTML entities, not RSS/Atom)
+    """
+    try:
+        return _head(iter_entries(body), limit, stop_at)
+    except (ET.ParseError, ValueError) as e:
+        logger.debug(f"Streaming parse failed: {e}")
+        return None
+
+
+def parse_feed_entries(body: bytes, limit: int, streaming: bool = True, source: str = '',
+                       stop_at: Optional[str] = None) -> List:
+    """
+    Parse the first `limit` entries of a feed
+    
+    Uses the streaming parser when enabled and falls back to feedparser,
+    which is slower but tolerant of broken feeds.
+    
+    Args:
+        body: Raw feed bytes
+        limit: Number of entries to keep
+        streaming: Try the streaming parser first
+        source: Feed URL (for log messages)
+        stop_at: Entry key to stop before (see parse_entries)
+    
+    Returns:
+        Entries (dicts or feedparser entries, both support .get())
+    """
+    if streaming:
+        entries = parse_entries(body, limit, stop_at)
+        if entries is not None:
+            return entries
+        logger.info(f"Falling back to feedparser for {source}")
+    
+    feed = feedparser.parse(body)
+    if feed.bozo:
+        logger.warning(f"Feed parsing warning for {source}: {feed.bozo_exception}")
+    return _head(feed.entries, limit, stop_at)
+
+
+if __name__ == "__main__":
+    # Benchmark: feedparser vs streaming parser on a large feed
+    import time
+    import tracemalloc
+    
+    item_count = 500
+    limit = 20
+    content = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 80 + "</p>"
+    items = ''.join(
+        f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+        f"<guid>https://example.com/{i}</guid>"
+        f"<pubDate>Mon, 06 Jan 2025 {i % 24:02d}:00:00 +0000</pubDate>"
+        f"<description><![CDATA[Summary of story {i}]]></description>"
+        f"<content:encoded><![CDATA[{content}]]></content:encoded></item>"
+        for i in range(item_count)
+    )
+    body = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f'<channel><title>Bench</title><link>https://example.com</link>{items}</channel></rss>'
+    ).encode('utf-8')
+    
+    def run_feedparser():
+        return feedparser.parse(body).entries[:limit]
+    
+    def run_streaming():
+        return parse_entries(body, limit)
+    
+    print(f"\n📰 {item_count} items, {len(body) / 1024:.0f} KB, keeping {limit}")
+    results = {}
+    for name, parse in (('feedparser', run_feedparser), ('streaming', run_streaming)):
+        started = time.perf_counter()
+        for _ in range(5):
+            entries = parse()
+        elapsed = (time.perf_counter() - started) / 5
+        
+        tracemalloc.start()
+        parse()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        
+        results[name] = entries
+        print(f"   {name:10s} {elapsed * 1000:8.1f} ms   peak {peak / 1024 / 1024:6.1f} MB")
+    
+    # Both paths must agree on what _parse_entry reads
+    for ours, theirs in zip(results['streaming'], results['feedparser']):
+        for key in ('id', 'title', 'link', 'published', 'published_parsed'):
+            assert ours.get(key) == theirs.get(key), (key, ours.get(key), theirs.get(key))
+    
+    # Malformed input falls back to feedparser
+    broken = b'<rss><channel><item><title>Caf&eacute;</title><link>https://example.com/x</link></item>'
+    assert parse_entries(broken, limit) is None
+    assert parse_feed_entries(broken, limit)[0]['link'] == 'https://example.com/x'
+    
+    # Incremental parse: only the entries above the previous newest one are read
+    newest = parse_entries(body, 5)
+    assert [entry_key(e) for e in parse_entries(body, limit, stop_at=entry_key(newest[3]))] \
+        == [entry_key(e) for e in newest[:3]]
+    print("   ✅ Entries match feedparser; malformed feeds fall back\n")
@@ -0,0 +1,183 @@
+"""
+Twitter News Curator - Feed Poller Module
+Background thread that keeps the shared article store fresh
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from datetime import datetime
+
+from feed_scheduler import FeedScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class FeedPoller:
+    """Refreshes RSS feeds on a schedule, independently of request handling"""
+    
+    def __init__(self, fetcher, store, interval: float = 300, limit: int = 20, tick: float = 15,
+                 scheduler: Optional[FeedScheduler] = None):
+        """
+        Initialize FeedPoller
+        
+        Args:
+            fetcher: NewsFetcher providing the configured feed list
+            store: ArticleCache the refreshed articles are written to
+            interval: Initial seconds between polls of a feed (adapted per feed)
+            limit: Articles kept per feed
+            tick: Seconds between checks for feeds that are due
+            scheduler: FeedScheduler deciding when each feed is due
+        """
+        self.fetcher = fetcher
+        self.store = store
+        self.interval = interval
+        self.limit = limit
+        self.tick = tick
+        self.scheduler = scheduler or FeedScheduler(default_interval=interval)
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._feed_stats: Dict[str, Dict] = {}
+        self._last_cycle: Dict = {}
+    
+    @classmethod
+    def from_config(cls, fetcher, store) -> "FeedPoller":
+        """Build a FeedPoller from the fetcher's 'poller' config section"""
+        settings = fetcher.config.get('poller', {})
+        interval = settings.get('interval_seconds', 300)
+        scheduler = FeedScheduler(
+            settings.get('state_file', 'data/feed_schedule.json'),
+            default_interval=interval,
+            min_interval=settings.get('min_interval_seconds', 120),
+            max_interval=settings.get('max_interval_seconds', 6 * 3600)
+        )
+        return cls(
+            fetcher,
+            store,
+            interval=interval,
+            limit=settings.get('articles_per_feed', 20),
+            scheduler=scheduler
+        )
+    
+    def start(self):
+        """Start polling in a daemon thread (no-op if already running)"""
+        if self.is_running():
+            return
+        
+        self.store.background_refresh_only = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="feed-poller", daemon=True)
+        self._thread.start()
+        logger.info(f"Feed poller started (interval: {self.interval}s)")
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop polling and wait for the current cycle to finish"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.store.background_refresh_only = False
+        logger.info("Feed poller stopped")
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Feed poller cycle failed: {str(e)}")
+            self._stop_event.wait(self.tick)
+    
+    def due_feeds(self, now: Optional[float] = None) -> List[str]:
+        """Get configured feeds whose next poll time has passed"""
+        return self.scheduler.due_feeds(list(self.fetcher.rss_feeds), now)
+    
+    def poll_once(self, force: bool = False) -> Dict[str, Dict]:
+        """
+        Refresh every feed that is due
+        
+        Args:
+            force: Refresh all configured feeds regardless of schedule
+        
+        Returns:
+            Per-feed fetch report for the feeds that were polled
+        """
+        feeds = list(self.fetcher.rss_feeds) if force else self.due_feeds()
+        if not feeds:
+            return {}
+        
+        started = time.time()
+        report = self.store.refresh(self.limit, feeds)
+        finished = time.time()
+        
+        for feed_url, status in report.items():
+            self.scheduler.record_poll(
+                feed_url,
+                status['status'] == 'ok',
+                self.store.get_feed_articles(feed_url),
+                now=finished
+            )
+        self.scheduler.save()
+        
+        with self._lock:
+            for feed_url, status in report.items():
+                self._record(feed_url, status, finished)
+            self._last_cycle = {
+                'started_at': datetime.fromtimestamp(started).isoformat(),
+                'duration': round(finished - started, 3),
+                'feeds': len(feeds)
+            }
+        
+        return report
+    
+    def _record(self, feed_url: str, status: Dict, now: float):
+        """Update per-feed statistics (caller holds the lock)"""
+        stats = self._feed_stats.setdefault(feed_url, {
+            'polls': 0,
+            'errors': 0,
+            'consecutive_errors': 0,
+            'skipped': 0,
+            'last_error': None,
+            'last_success': None
+        })
+        stats['polls'] += 1
+        stats['last_refresh'] = datetime.fromtimestamp(now).isoformat()
+        stats['last_status'] = status['status']
+        stats['duration'] = status['duration']
+        stats['count'] = status['count']
+        stats['new'] = status.get('new')
+        
+        if status['status'] == 'ok':
+            stats['consecutive_errors'] = 0
+            stats['last_success'] = stats['last_refresh']
+        elif status['status'] == 'skipped':
+            stats['skipped'] += 1
+        else:
+            stats['errors'] += 1
+            stats['consecutive_errors'] += 1
+            stats['last_error'] = status.get('error')
+    
+    def get_status(self) -> Dict:
+        """Get poller state, last cycle timing and per-feed refresh statistics"""
+        schedule = self.scheduler.get_schedule()
+        with self._lock:
+            feeds = {}
+            for feed_url, stats in self._feed_stats.items():
+                feeds[feed_url] = dict(stats)
+                if feed_url in schedule:
+                    feeds[feed_url].update(
+                        interval=schedule[feed_url]['interval'],
+                        learned_interval=schedule[feed_url]['learned_interval'],
+                        next_poll=datetime.fromtimestamp(schedule[feed_url]['next_poll']).isoformat()
+                    )
+            
+            return {
+                'running': self.is_running(),
+                'interval': self.interval,
+                'last_cycle': dict(self._last_cycle),
+                'feeds': feeds
+            }
@@ -0,0 +1,169 @@
+"""
+Twitter News Curator - Feed Scheduler Module
+Learns each feed's publish cadence and schedules polls adaptively
+"""
+
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class FeedScheduler:
+    """Per-feed adaptive poll intervals with backoff, persisted across restarts"""
+    
+    def __init__(self, state_file: str = "data/feed_schedule.json", default_interval: float = 300,
+                 min_interval: float = 120, max_interval: float = 6 * 3600,
+                 unchanged_backoff: float = 1.5, error_backoff: float = 2.0):
+        """
+        Initialize FeedScheduler
+        
+        Args:
+            state_file: Path to JSON file persisting learned intervals
+            default_interval: Interval for feeds with no history yet
+            min_interval: Shortest allowed interval between polls of one feed
+            max_interval: Longest allowed interval between polls of one feed
+            unchanged_backoff: Interval multiplier after a poll found nothing new
+            error_backoff: Interval multiplier per consecutive failed poll
+        """
+        self.state_file = Path(state_file)
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.unchanged_backoff = unchanged_backoff
+        self.error_backoff = error_backoff
+        
+        self._lock = threading.Lock()
+        self.feeds = self._load_data()
+        logger.info(f"Loaded poll schedule for {len(self.feeds)} feeds")
+    
+    def _load_data(self) -> Dict:
+        """Load learned intervals from JSON file"""
+        if not self.state_file.exists():
+            return {}
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading feed schedule: {e}")
+            return {}
+    
+    def save(self):
+        """Write the schedule to disk (atomic replace)"""
+        with self._lock:
+            snapshot = json.dumps(self.feeds, indent=2)
+        
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Error saving feed schedule: {e}")
+    
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+    
+    def due_feeds(self, feed_urls: List[str], now: Optional[float] = None) -> List[str]:
+        """
+        Get the feeds whose next poll time has passed
+        
+        Args:
+            feed_urls: Candidate feed URLs
+            now: Current epoch time (defaults to time.time())
+        
+        Returns:
+            Feed URLs that should be polled now (unknown feeds are always due)
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            return [
+                feed_url for feed_url in feed_urls
+                if self.feeds.get(feed_url, {}).get('next_poll', 0) <= now
+            ]
+    
+    def record_poll(self, feed_url: str, ok: bool, articles: Optional[List[Dict]] = None,
+                    now: Optional[float] = None) -> float:
+        """
+        Update a feed's learned cadence after a poll and schedule the next one
+        
+        Args:
+            feed_url: RSS feed URL
+            ok: Whether the poll succeeded
+            articles: The feed's current articles (used to learn the publish cadence)
+            now: Current epoch time (defaults to time.time())
+        
+        Returns:
+            Seconds until the feed's next poll
+        """
+        now = now if now is not None else time.time()
+        
+        with self._lock:
+            state = self.feeds.setdefault(feed_url, {
+                'learned_interval': self.default_interval,
+                'interval': self.default_interval,
+                'newest_published': 0,
+                'errors': 0
+            })
+            
+            if not ok:
+                state['errors'] += 1
+                interval = state['learned_interval'] * self.error_backoff ** state['errors']
+            else:
+                state['errors'] = 0
+                published = self._publish_times(articles or [])
+                newest = published[0] if published else 0
+                
+                cadence = self._cadence(published)
+                if cadence:
+                    # Smooth so one burst of posts doesn't swing the interval
+                    state['learned_interval'] = self._clamp(
+                        0.5 * state['learned_interval'] + 0.5 * cadence
+                    )
+                
+                if newest > state['newest_published']:
+                    state['newest_published'] = newest
+                    interval = state['learned_interval']
+                else:
+                    # Nothing new since last poll - back off gradually
+                    interval = state['interval'] * self.unchanged_backoff
+            
+            state['interval'] = self._clamp(interval)
+            state['last_poll'] = now
+            state['next_poll'] = now + state['interval']
+            return state['interval']
+    
+    @staticmethod
+    def _publish_times(articles: List[Dict]) -> List[int]:
+        """Epoch publish times of the articles, newest first"""
+        times = [article['published_ts'] for article in articles if article.get('published_ts')]
+        return sorted(times, reverse=True)
+    
+    @staticmethod
+    def _cadence(published: List[int]) -> Optional[float]:
+        """Median gap between consecutive publish times, or None if unknown"""
+        gaps = [newer - older for newer, older in zip(published, published[1:]) if newer > older]
+        if not gaps:
+            return None
+        return float(statistics.median(gaps))
+    
+    def get_schedule(self) -> Dict[str, Dict]:
+        """Get learned and current intervals for every known feed"""
+        with self._lock:
+            return {
+                feed_url: {
+                    'learned_interval': round(state['learned_interval']),
+                    'interval': round(state['interval']),
+                    'next_poll': state.get('next_poll'),
+                    'errors': state['errors']
+                }
+                for feed_url, state in self.feeds.items()
+            }
@@ -0,0 +1,77 @@
+"""
+Twitter News Curator - File Lock Module
+Cross-process lock on a lock file, also safe between threads of one process
+"""
+
+import os
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Exclusive lock shared by every process that opens the same lock file
+    
+    Re-entrant within a thread. Uses flock on POSIX and msvcrt.locking on
+    Windows.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize FileLock
+        
+        Args:
+            path: Lock file (created if missing, never deleted)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+    
+    def acquire(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return
+        
+        try:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            self._close()
+            self._depth -= 1
+            self._thread_lock.release()
+            raise
+    
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            self._close()
+        self._thread_lock.release()
+    
+    def _close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
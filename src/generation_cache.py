@@ -0,0 +1,258 @@
+"""
+Twitter News Curator - Generation Cache Module
+Disk-backed LRU cache of generated tweets, so repeat drafts cost no API quota
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """
+    Generated tweets keyed by everything that shaped them
+    
+    Entries expire after `ttl_hours` and the least recently used are
+    evicted beyond `max_entries`. The file is shared by every process that
+    generates (dashboard and run.py) and reloaded when another one rewrote it.
+    
+    New entries are written behind, like the tracker's write_behind: the
+    file is rewritten every `flush_interval` seconds, once `max_pending`
+    entries are waiting, when the outermost batch() exits, and on close()
+    or interpreter exit. Unsaved entries are served in this process straight
+    away and survive reloads of the file; a crash loses them, which only
+    costs regenerating those tweets.
+    """
+    
+    def __init__(self, cache_file: str = "data/generation_cache.json", max_entries: int = 2000,
+                 ttl_hours: float = 168, max_pending: int = 50, flush_interval: float = 5.0):
+        """
+        Initialize GenerationCache
+        
+        Args:
+            cache_file: Path to JSON file persisting the cache
+            max_entries: Maximum number of cached tweets (least recently used are evicted)
+            ttl_hours: Age after which a cached tweet is no longer served
+            max_pending: Unsaved entries that trigger a write (0: no limit)
+            flush_interval: Seconds between background writes (0: no
+                background thread)
+        """
+        self.cache_file = Path(cache_file)
+        self.max_entries = max_entries
+        self.ttl = ttl_hours * 3600
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # Entries put since the last write, re-applied when the file is reloaded
+        self._unsaved: Dict[str, Dict] = {}
+        self._batch_depth = 0
+        self._mtime = None
+        self.hits = 0
+        self.misses = 0
+        
+        self._load_data()
+        logger.info(f"Loaded {len(self._entries)} cached generations")
+        
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="generation-cache-flush",
+                                             daemon=True)
+            self._flusher.start()
+        atexit.register(self.flush)
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash of the inputs of a generation (prompt version, model, temperature, prompt, ...)"""
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    def _load_data(self):
+        """Load cached generations from JSON file, written least recently used first (caller holds the lock)"""
+        try:
+            mtime = self.cache_file.stat().st_mtime
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error loading generation cache: {e}")
+            return
+        
+        self._entries = OrderedDict(entries)
+        for key, entry in self._unsaved.items():
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        self._mtime = mtime
+    
+    def _reload_if_changed(self):
+        """Pick up a cache file rewritten by another process (caller holds the lock)"""
+        try:
+            mtime = self.cache_file.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._load_data()
+    
+    def _save_data(self):
+        """Write the cache to disk, atomic replace (caller holds the lock)"""
+        snapshot = json.dumps(self._entries, ensure_ascii=False)
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.cache_file)
+            self._mtime = self.cache_file.stat().st_mtime
+            self._unsaved.clear()
+        except Exception as e:
+            logger.error(f"Error saving generation cache: {e}")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached tweet
+        
+        Args:
+            key: Generation key (see make_key)
+        
+        Returns:
+            Tweet text, or None if not cached or expired
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+            if entry and time.time() - entry['created_at'] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['tweet']
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, tweet: str):
+        """
+        Cache a generated tweet (written to the file later, see the class docstring)
+        
+        The least recently used entries beyond max_entries are dropped.
+        
+        Args:
+            key: Generation key (see make_key)
+            tweet: Generated tweet text
+        """
+        entry = {'tweet': tweet, 'created_at': time.time()}
+        with self._lock:
+            self._reload_if_changed()
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._unsaved[key] = entry
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._unsaved.pop(evicted, None)
+            flush = self.max_pending and len(self._unsaved) >= self.max_pending and not self._batch_depth
+        if flush:
+            self.flush()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Write the entries put inside the block (from any thread) once, when it exits
+        
+        Usage:
+            with cache.batch():
+                for prompt in prompts:
+                    cache.put(GenerationCache.make_key(...), generate(prompt))
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                done = self._batch_depth == 0
+            if done:
+                self.flush()
+    
+    def flush(self) -> int:
+        """
+        Merge unsaved entries into the cache file, dropping expired entries
+        
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            if not self._unsaved:
+                return 0
+            count = len(self._unsaved)
+            # Under the lock, so a concurrent reload can't drop an unsaved entry
+            self._reload_if_changed()
+            now = time.time()
+            expired = [k for k, entry in self._entries.items() if now - entry['created_at'] > self.ttl]
+            for k in expired:
+                del self._entries[k]
+            self._save_data()
+        logger.debug(f"Flushed {count} cached generations")
+        return count
+    
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing generation cache: {e}")
+    
+    def close(self):
+        """Stop the background writer and write what is left"""
+        self._closed.set()
+        if self._flusher:
+            self._flusher.join()
+        atexit.unregister(self.flush)
+        self.flush()
+    
+    def get_stats(self) -> Dict:
+        """Get size and hit/miss counts"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+if __name__ == "__main__":
+    # Benchmark: inserts into and hits from a full cache
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = GenerationCache(os.path.join(tmp, "generations.json"), max_entries=2000, ttl_hours=1)
+        keys = [GenerationCache.make_key(1, "gemini", 0.9, f"prompt {i}") for i in range(2500)]
+        
+        started = time.perf_counter()
+        for i, key in enumerate(keys):
+            cache.put(key, f"Tweet {i}")
+        put_time = (time.perf_counter() - started) / len(keys)
+        
+        started = time.perf_counter()
+        for key in keys[-1000:]:
+            cache.get(key)
+        get_time = (time.perf_counter() - started) / 1000
+        cache.close()
+    
+    print(f"\n💾 Generation cache (2,000 entries)")
+    print(f"   hit      {get_time * 1e6:7.1f} µs")
+    print(f"   insert   {put_time * 1e3:7.2f} ms (file rewritten every {cache.max_pending} inserts)\n")
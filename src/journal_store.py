@@ -0,0 +1,416 @@
+"""
+Twitter News Curator - Journal Store Module
+Append-only journal plus snapshot for crash-safe, constant-time record writes
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+
+from file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+class JournalStore:
+    """
+    Key/record store persisted as a JSON snapshot plus a JSON-lines journal
+    
+    Every change is one appended journal line, so a write costs the same no
+    matter how many records exist. Loading reads the snapshot and replays the
+    journal on top; a torn last line from a crash is dropped. Compaction folds
+    the journal into a new snapshot (written atomically) in the background,
+    holding the lock so no other process writes while the journal restarts.
+    The background thread works on a copy of the records and never changes
+    `records` itself; close() folds what is left of the journal into the
+    snapshot, so a one-shot run leaves its posts in the snapshot file.
+    
+    Several processes can share one store: writes and compaction hold a lock
+    file, and refresh() applies just the journal lines other processes added
+    since the last call (a single stat when nothing changed).
+    
+    Replaying journal operations is idempotent, so a crash at any point of a
+    compaction leaves a state that loads correctly. Not thread-safe on its
+    own: callers serialize access to `records`.
+    """
+    
+    def __init__(self, snapshot_file: str, fsync: str = 'interval', fsync_interval: float = 1.0,
+                 compact_every: int = 500):
+        """
+        Initialize JournalStore
+        
+        Args:
+            snapshot_file: Path to the JSON snapshot; the journal sits next to
+                it with a .journal suffix
+            fsync: 'always' (fsync every write), 'interval' (at most every
+                fsync_interval seconds) or 'never' (leave it to the OS)
+            fsync_interval: Seconds between fsyncs for the 'interval' policy
+            compact_every: Journal lines that trigger a background compaction
+                (or the record count, if larger, so rewriting the snapshot
+                stays a constant cost per write)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        
+        self.snapshot_file = Path(snapshot_file)
+        self.journal_file = self.snapshot_file.with_suffix('.journal')
+        # Rotated journal left by an interrupted compaction of an older version
+        self.compacting_file = self.snapshot_file.with_suffix('.journal.1')
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        
+        self.records: Dict[str, Dict] = {}
+        # Bumped whenever records change because of another process's writes
+        self.version = 0
+        
+        self._file_lock = FileLock(self.snapshot_file.with_suffix('.lock'))
+        self._lock = threading.Lock()
+        self._journal = None
+        self._journal_ino = None
+        self._offset = 0
+        self._journal_lines = 0
+        self._last_fsync = 0.0
+        # Set when a compaction folded in lines `records` hasn't applied yet: the next refresh reloads
+        self._stale = False
+        self._compacting = False
+        self._compaction_thread = None
+    
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load the snapshot and replay the journal on top of it
+        
+        Returns:
+            Records keyed by ID (the live `records` dict)
+        """
+        with self._file_lock:
+            self._load_locked()
+        return self.records
+    
+    def _load_locked(self):
+        """Full reload (caller holds the file lock)"""
+        records: Dict[str, Dict] = {}
+        if self.snapshot_file.exists():
+            try:
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading snapshot {self.snapshot_file}: {e}")
+        
+        self._journal_lines = 0
+        if self.compacting_file.exists():
+            self._journal_lines += self._replay(self.compacting_file, records)
+        if self.journal_file.exists():
+            self._journal_lines += self._replay(self.journal_file, records)
+        
+        self.records.clear()
+        self.records.update(records)
+        self.version += 1
+        self._stale = False
+        
+        if self.compacting_file.exists():
+            # Left by an interrupted compaction of an older version - fold it in now
+            self._write_snapshot(self.records)
+        else:
+            self._open_journal()
+    
+    def _open_journal(self):
+        if self._journal:
+            self._journal.close()
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        stat = os.fstat(self._journal.fileno())
+        self._journal_ino = stat.st_ino
+        self._offset = stat.st_size
+    
+    @staticmethod
+    def _replay(journal: Path, records: Dict[str, Dict], offset: int = 0) -> int:
+        """Apply a journal from offset, truncating a torn tail; returns lines applied"""
+        applied = 0
+        good_offset = offset
+        with open(journal, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                try:
+                    if not raw.endswith(b'\n'):
+                        raise ValueError("incomplete line")
+                    JournalStore._apply(records, json.loads(raw))
+                except ValueError as e:
+                    logger.warning(f"Ignoring torn journal entry in {journal} at byte {good_offset}: {e}")
+                    break
+                good_offset += len(raw)
+                applied += 1
+        
+        if good_offset < journal.stat().st_size:
+            with open(journal, 'r+b') as f:
+                f.truncate(good_offset)
+        return applied
+    
+    @staticmethod
+    def _apply(records: Dict[str, Dict], entry: Dict):
+        op = entry['op']
+        if op == 'set':
+            records[entry['key']] = entry['value']
+        elif op == 'del':
+            records.pop(entry['key'], None)
+        elif op == 'clear':
+            records.clear()
+        else:
+            raise ValueError(f"unknown op {op!r}")
+    
+    def refresh(self) -> bool:
+        """
+        Apply changes written by other processes
+        
+        Returns:
+            True if records changed
+        """
+        try:
+            stat = os.stat(self.journal_file)
+            if not self._stale and stat.st_ino == self._journal_ino and stat.st_size == self._offset:
+                return False
+        except FileNotFoundError:
+            pass
+        
+        with self._file_lock:
+            return self._refresh_locked()
+    
+    def _refresh_locked(self) -> bool:
+        """Catch up with the journal (caller holds the file lock)"""
+        try:
+            stat = os.stat(self.journal_file)
+        except FileNotFoundError:
+            stat = None
+        
+        if self._stale or stat is None or stat.st_ino != self._journal_ino or stat.st_size < self._offset:
+            # Rotated by another process's compaction (or folded in lines we
+            # hadn't applied) - start over from the snapshot
+            self._load_locked()
+            return True
+        if stat.st_size == self._offset:
+            return False
+        
+        self._journal_lines += self._replay(self.journal_file, self.records, self._offset)
+        self._offset = self.journal_file.stat().st_size
+        self.version += 1
+        return True
+    
+    def position(self) -> str:
+        """Current journal position ("inode:offset"), for keys_since()"""
+        return f"{self._journal_ino}:{self._offset}"
+    
+    def keys_since(self, position: str) -> Optional[List[str]]:
+        """
+        Keys set in the journal between position and the current position
+        
+        Call after refresh(). Returns None when the position is not in the
+        current journal (it was rotated by a compaction since, or the position
+        is not one of ours): every record may have changed.
+        """
+        try:
+            journal_ino, offset = map(int, position.split(':'))
+        except ValueError:
+            return None
+        if journal_ino != self._journal_ino or offset > self._offset:
+            return None
+        
+        with open(self.journal_file, 'rb') as f:
+            f.seek(offset)
+            data = f.read(self._offset - offset)
+        keys = []
+        for raw in data.splitlines():
+            entry = json.loads(raw)
+            if entry['op'] == 'set':
+                keys.append(entry['key'])
+        return keys
+    
+    def _append(self, entry: Dict):
+        """Apply an entry and append it as one journal line, flushed per the fsync policy"""
+        self._append_many([entry])
+    
+    def _append_many(self, entries: List[Dict]):
+        """Apply entries and append them with a single write (and at most one fsync)"""
+        data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+        with self._file_lock:
+            self._refresh_locked()
+            for entry in entries:
+                self._apply(self.records, entry)
+            
+            self._journal.write(data)
+            self._journal.flush()
+            now = time.monotonic()
+            if self.fsync == 'always' or (
+                self.fsync == 'interval' and now - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(self._journal.fileno())
+                self._last_fsync = now
+            self._offset += len(data.encode('utf-8'))
+            self._journal_lines += len(entries)
+    
+    def set(self, key: str, value: Dict):
+        """Store a new or updated record"""
+        self._append({'op': 'set', 'key': key, 'value': value})
+    
+    def set_many(self, items: Iterable[Tuple[str, Dict]]):
+        """Store many records as one locked append"""
+        entries = [{'op': 'set', 'key': key, 'value': value} for key, value in items]
+        if entries:
+            self._append_many(entries)
+    
+    def delete(self, key: str):
+        """Remove a record"""
+        self._append({'op': 'del', 'key': key})
+    
+    def delete_many(self, keys: Iterable[str]):
+        """Remove many records as one locked append"""
+        entries = [{'op': 'del', 'key': key} for key in keys]
+        if entries:
+            self._append_many(entries)
+    
+    def clear(self):
+        """Remove all records"""
+        self._append({'op': 'clear'})
+    
+    def needs_compaction(self) -> bool:
+        with self._lock:
+            threshold = max(self.compact_every, len(self.records))
+            return not self._compacting and self._journal_lines >= threshold
+    
+    def compact(self, background: bool = True):
+        """
+        Fold the journal into a fresh snapshot
+        
+        The records are copied here, in the caller's thread (which
+        serializes access to `records`); a background compaction writes the
+        copy plus whatever was appended to the journal after it.
+        
+        Args:
+            background: Run in a daemon thread instead of the caller's
+        """
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+        
+        copy = (dict(self.records), self._journal_ino, self._offset)
+        if background:
+            self._compaction_thread = threading.Thread(target=self._compact, args=copy,
+                                                       name="journal-compaction", daemon=True)
+            self._compaction_thread.start()
+        else:
+            self._compact(*copy)
+    
+    def _compact(self, records: Dict[str, Dict], journal_ino: int, offset: int):
+        """Write a snapshot from a private copy of the records taken at journal position (ino, offset)"""
+        try:
+            with self._file_lock:
+                try:
+                    stat = os.stat(self.journal_file)
+                except FileNotFoundError:
+                    stat = None
+                if stat is None or stat.st_ino != journal_ino or stat.st_size < offset:
+                    # Another process compacted since the copy was taken
+                    return
+                
+                # Lines appended after the copy; any past our own position
+                # were written by other processes and aren't in `records` yet
+                self._replay(self.journal_file, records, offset)
+                behind = stat.st_size > self._offset
+                self._write_snapshot(records)
+                if behind:
+                    self._stale = True
+            logger.debug(f"Compacted journal into {self.snapshot_file}")
+        except Exception as e:
+            logger.error(f"Error compacting journal: {e}")
+        finally:
+            with self._lock:
+                self._compacting = False
+    
+    def _write_snapshot(self, records: Dict[str, Dict]):
+        """
+        Replace the snapshot and start an empty journal (caller holds the file lock)
+        
+        The snapshot is replaced first, so a crash in between only leaves
+        journal lines that are already in the snapshot. The new journal is a
+        new file: other processes see its inode change and reload. Our
+        append handle is closed while the journal is replaced (Windows can't
+        replace an open file).
+        """
+        tmp_file = self.snapshot_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        
+        empty_journal = self.journal_file.with_suffix('.journal.tmp')
+        open(empty_journal, 'w').close()
+        if self._journal and not self._journal.closed:
+            self._journal.flush()
+            self._journal.close()
+        os.replace(empty_journal, self.journal_file)
+        self.compacting_file.unlink(missing_ok=True)
+        
+        self._open_journal()
+        self._journal_lines = 0
+    
+    def close(self):
+        """
+        Wait for a running compaction, fold the journal into the snapshot and close it
+        
+        Callers serialize this with other access to `records`, as for writes.
+        """
+        if self._compaction_thread:
+            self._compaction_thread.join()
+        if self._journal is None or self._journal.closed:
+            return
+        with self._file_lock:
+            self._refresh_locked()
+            if self._journal_lines:
+                self._write_snapshot(self.records)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal.close()
+
+
+if __name__ == "__main__":
+    # Benchmark: per-post write cost, journal vs full-file rewrite
+    import tempfile
+    from datetime import datetime
+    
+    def record(i):
+        return {'title': f"Article {i}", 'posted_at': datetime.now().isoformat(),
+                'tweet_id': str(i), 'source': 'https://example.com/rss'}
+    
+    
+    print("\n📝 Write cost per post (fsync='never')")
+    with tempfile.TemporaryDirectory() as tmp:
+        for history in (1_000, 10_000, 50_000):
+            records = {f"https://example.com/{i}": record(i) for i in range(history)}
+            
+            rewrite_file = Path(tmp) / f"rewrite_{history}.json"
+            started = time.perf_counter()
+            for i in range(20):
+                records[f"https://example.com/new/{i}"] = record(i)
+                with open(rewrite_file, 'w', encoding='utf-8') as f:
+                    json.dump(records, f, indent=2, ensure_ascii=False)
+            rewrite = (time.perf_counter() - started) / 20
+            
+            store = JournalStore(Path(tmp) / f"journal_{history}.json", fsync='never',
+                                 compact_every=10 ** 9)
+            store.load()
+            store.records.update(records)
+            store.compact(background=False)
+            started = time.perf_counter()
+            for i in range(20):
+                store.set(f"https://example.com/new/{i}", record(i))
+            journal = (time.perf_counter() - started) / 20
+            store.close()
+            
+            print(f"   {history:>6,} posts   rewrite {rewrite * 1000:8.2f} ms   journal {journal * 1000:6.3f} ms")
+    print()
@@ -3,14 +3,57 @@ Twitter News Curator - News Fetcher Module
 Fetches latest articles from configured RSS feeds
 """
 
-import feedparser
+import calendar
+import hashlib
+import heapq
 import json
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import islice
+from typing import List, Dict, Optional, Tuple
+
+from article import Article
+from feed_cache import FeedCache
+from feed_parser import entry_key, parse_feed_entries
+from article_index import ArticleIndex, article_id
+from story_index import StoryIndex
+from url_utils import canonicalize_url, entry_url
+from feed_health import FeedHealth
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "TwitterNewsCurator/1.0 (+https://github.com/sidwashere/Twitter-News-Curator)"
+
+
+def merge_articles(article_lists: List[List[Article]], total_limit: Optional[int] = None) -> List[Article]:
+    """
+    k-way merge of per-feed article lists into one newest-first list
+    
+    Each list is sorted on its own (feeds are usually newest-first already, so
+    this is typically just a check), then merged with a heap, so the cost grows
+    with log(number of feeds) rather than sorting everything.
+    
+    Args:
+        article_lists: One list of articles per feed
+        total_limit: Stop after this many articles (None for all)
+    
+    Returns:
+        Articles ordered by published_ts, newest first
+    """
+    ordered = []
+    for articles in article_lists:
+        times = [article.get('published_ts', 0) for article in articles]
+        if any(newer < older for newer, older in zip(times, times[1:])):
+            articles = sorted(articles, key=lambda x: x.get('published_ts', 0), reverse=True)
+        if articles:
+            ordered.append(articles)
+    
+    merged = heapq.merge(*ordered, key=lambda x: x.get('published_ts', 0), reverse=True)
+    return list(islice(merged, total_limit))
+
 
 class NewsFetcher:
     """Fetches and parses RSS feeds for tech news"""
@@ -26,60 +69,349 @@ class NewsFetcher:
             self.config = json.load(f)
         
         self.rss_feeds = self.config.get('rss_feeds', [])
+        
+        fetch_settings = self.config.get('fetch_settings', {})
+        self.max_workers = fetch_settings.get('max_workers', 8)
+        self.feed_timeout = fetch_settings.get('feed_timeout', 10)
+        self.fetch_deadline = fetch_settings.get('fetch_deadline', 20)
+        self.streaming_parser = fetch_settings.get('streaming_parser', True)
+        self.feed_cache = FeedCache(fetch_settings.get('cache_file', 'data/feed_cache.json'))
+        self.health = FeedHealth(
+            window=fetch_settings.get('health_window', 50),
+            failure_threshold=fetch_settings.get('breaker_failure_threshold', 3),
+            cooldown=fetch_settings.get('breaker_cooldown', 300),
+            max_cooldown=fetch_settings.get('breaker_max_cooldown', 3600)
+        )
+        
+        index_settings = self.config.get('article_index', {})
+        self.index = ArticleIndex(
+            index_settings.get('index_file', 'data/article_index.json'),
+            max_size=index_settings.get('max_size', 5000)
+        )
+        
+        story_settings = self.config.get('story_clustering', {})
+        self.stories = None
+        if story_settings.get('enabled', True):
+            self.stories = StoryIndex(
+                story_settings.get('index_file', 'data/story_index.json'),
+                window_hours=story_settings.get('window_hours', 48),
+                threshold=story_settings.get('threshold', 0.3),
+                band_size=story_settings.get('band_size', 3)
+            )
+        
+        # Per-feed status of the most recent fetch (see fetch_with_report)
+        self.last_fetch_report: Dict[str, Dict] = {}
+        
         logger.info(f"Initialized with {len(self.rss_feeds)} RSS feeds")
     
-    def fetch_latest_articles(self, limit: int = 10) -> List[Dict]:
+    def fetch_latest_articles(self, limit: int = 10, feeds: Optional[List[str]] = None,
+                              total_limit: Optional[int] = None) -> List[Article]:
         """
         Fetch latest articles from all configured RSS feeds
         
         Args:
             limit: Maximum number of articles to return per feed
-            
+            feeds: Feed URLs to fetch (defaults to all configured feeds)
+            total_limit: Maximum number of articles overall (newest first)
+        
         Returns:
-            List of article dictionaries with title, summary, link, published
+            List of Articles with title, summary, link, published
         """
-        all_articles = []
+        articles, _ = self.fetch_with_report(limit=limit, feeds=feeds, total_limit=total_limit)
+        return articles
+    
+    def fetch_with_report(self, limit: int = 10, parallel: bool = True,
+                          feeds: Optional[List[str]] = None,
+                          total_limit: Optional[int] = None) -> Tuple[List[Article], Dict[str, Dict]]:
+        """
+        Fetch all configured feeds and report the outcome for each one
         
-        for feed_url in self.rss_feeds:
-            try:
-                logger.info(f"Fetching from: {feed_url}")
-                feed = feedparser.parse(feed_url)
-                
-                if feed.bozo:
-                    logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
-                
-                for entry in feed.entries[:limit]:
-                    article = self._parse_entry(entry, feed_url)
-                    if article:
-                        all_articles.append(article)
-                
-                logger.info(f"Fetched {len(feed.entries[:limit])} articles from {feed_url}")
+        Feeds are downloaded concurrently (up to max_workers at a time), each
+        with its own socket timeout. Feeds still running when the overall
+        fetch_deadline expires are abandoned and reported as 'timeout'; the
+        articles from every feed that did finish are still returned. Feeds
+        whose circuit breaker is open are not contacted at all and are
+        reported as 'skipped'.
+        
+        Args:
+            limit: Maximum number of articles to return per feed
+            parallel: Fetch feeds concurrently (False fetches one at a time)
+            feeds: Feed URLs to fetch (defaults to all configured feeds)
+            total_limit: Maximum number of articles overall (newest first)
+        
+        Returns:
+            Tuple of (articles, report) where report maps each feed URL to a
+            dict with status ('ok', 'error', 'timeout' or 'skipped'), count,
+            new (articles above the feed's high-water mark), duration and error
+        """
+        all_articles, _, report = self._fetch_all(limit, parallel, feeds)
+        if total_limit is not None:
+            all_articles = all_articles[:total_limit]
+        return all_articles, report
+    
+    def _fetch_all(self, limit: int, parallel: bool,
+                   feeds: Optional[List[str]]) -> Tuple[List[Article], List[Article], Dict[str, Dict]]:
+        """
+        Fetch feeds (see fetch_with_report)
+        
+        Returns:
+            Tuple of (articles, new articles, report), articles newest first
+        """
+        feeds = list(feeds if feeds is not None else self.rss_feeds)
+        feed_articles = []
+        new_lists = []
+        report = {}
+        started = time.monotonic()
+        
+        # Feeds that keep failing are left alone until their cooldown expires
+        active = []
+        for feed_url in feeds:
+            if self.health.allow_request(feed_url):
+                active.append(feed_url)
+            else:
+                report[feed_url] = self._status('skipped', 0, 0.0, "Circuit open after repeated failures")
+        
+        if parallel and len(active) > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, min(self.max_workers, len(active))),
+                thread_name_prefix="feed-fetch"
+            )
+            futures = {executor.submit(self._fetch_feed, url, limit): url for url in active}
+            done, not_done = wait(futures, timeout=self.fetch_deadline)
+            
+            # Don't block on stragglers - their sockets time out on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+            for future in done:
+                articles, new_articles, status = future.result()
+                feed_articles.append(articles)
+                new_lists.append(new_articles)
+                report[futures[future]] = status
+            
+            for future in not_done:
+                feed_url = futures[future]
+                if future.cancelled():
+                    # Still queued at the deadline: never requested, so not the feed's fault
+                    report[feed_url] = self._status('skipped', 0, 0.0,
+                                                    f"Not started before the fetch deadline of "
+                                                    f"{self.fetch_deadline}s")
+                    continue
+                logger.warning(f"Feed missed fetch deadline ({self.fetch_deadline}s): {feed_url}")
+                report[feed_url] = self._status('timeout', 0, time.monotonic() - started,
+                                                f"Exceeded fetch deadline of {self.fetch_deadline}s")
+        else:
+            for feed_url in active:
+                if time.monotonic() - started > self.fetch_deadline:
+                    report[feed_url] = self._status('skipped', 0, 0.0,
+                                                    f"Not started before the fetch deadline of "
+                                                    f"{self.fetch_deadline}s")
+                    continue
                 
-            except Exception as e:
-                logger.error(f"Error fetching feed {feed_url}: {str(e)}")
-                continue
+                articles, new_articles, status = self._fetch_feed(feed_url, limit)
+                feed_articles.append(articles)
+                new_lists.append(new_articles)
+                report[feed_url] = status
         
-        # Sort by published date (most recent first)
-        all_articles.sort(key=lambda x: x.get('published_parsed', 0), reverse=True)
+        # Only feeds that were actually requested count towards their health
+        for feed_url in active:
+            status = report[feed_url]
+            if status['status'] == 'ok':
+                self.health.record_success(feed_url, status['duration'])
+            elif status['status'] != 'skipped':
+                self.health.record_failure(feed_url, status['duration'], status['error'])
         
-        logger.info(f"Total articles fetched: {len(all_articles)}")
-        return all_articles
+        # Merge per-feed lists by published date (most recent first)
+        all_articles = merge_articles(feed_articles)
+        new_articles = merge_articles(new_lists)
+        
+        # Keep the report in configured feed order
+        self.last_fetch_report = {url: report[url] for url in feeds if url in report}
+        
+        # Group reports of the same story from different feeds. Articles served
+        # from the feed cache already carry their story, so this is the delta
+        if self.stories is not None:
+            unassigned = [article for article in all_articles if not article.story_id]
+            if unassigned:
+                joined = self.stories.assign_many(unassigned)
+                if joined:
+                    logger.info(f"{joined} articles joined stories already reported by another feed")
+        
+        # Saved after story assignment so cached articles keep their story_id
+        self.feed_cache.save()
+        
+        # Remember every article returned so it can be resolved later without
+        # refetching. Not only the new ones: articles below the high-water mark
+        # (a larger limit, marks advanced by another process, older cache
+        # entries) are listed too. The index is written only if it changed
+        if all_articles:
+            self.index.add_many(all_articles)
+            self.index.save()
+        
+        failed = sum(1 for status in report.values() if status['status'] != 'ok')
+        logger.info(f"Total articles fetched: {len(all_articles)}, {len(new_articles)} new "
+                    f"({len(feeds) - failed}/{len(feeds)} feeds ok, {time.monotonic() - started:.2f}s)")
+        
+        return all_articles, new_articles, self.last_fetch_report
     
-    def _parse_entry(self, entry, source_url: str) -> Optional[Dict]:
+    def _fetch_feed(self, feed_url: str, limit: int) -> Tuple[List[Article], List[Article], Dict]:
+        """
+        Download and parse a single feed
+        
+        Entries above the feed's high-water mark are new. When the feed lists
+        newest first and its older articles are cached, parsing stops at the
+        previous top entry and the cached articles fill in the rest.
+        
+        Args:
+            feed_url: RSS feed URL
+            limit: Maximum number of articles to parse from the feed
+        
+        Returns:
+            Tuple of (articles, new articles, status); never raises
+        """
+        started = time.monotonic()
+        cached = self.feed_cache.lookup(feed_url, limit)
+        mark = self.feed_cache.high_water(feed_url)
+        
+        try:
+            logger.info(f"Fetching from: {feed_url}")
+            status_code, body, headers = self._download_feed(
+                feed_url, self.feed_cache.request_headers(cached)
+            )
+            etag = headers.get('ETag')
+            last_modified = headers.get('Last-Modified')
+            
+            # 304 Not Modified, or a server that ignores validators but sent the same bytes
+            content_hash = hashlib.sha256(body).hexdigest() if status_code != 304 else None
+            if cached and (status_code == 304 or content_hash == cached.get('content_hash')):
+                self.feed_cache.record_hit(feed_url, etag, last_modified)
+                articles = cached['articles'][:limit]
+                logger.info(f"Feed unchanged, using {len(articles)} cached articles from {feed_url}")
+                return articles, [], self._status('ok', len(articles), time.monotonic() - started,
+                                                  cache='hit', new=0)
+            
+            # Streaming parse stops after `limit` entries (or at the previous top
+            # entry when the rest is cached); feedparser handles broken feeds
+            stop_at = mark['guid'] if cached and mark and mark.get('ordered') else None
+            entries = parse_feed_entries(body, limit, self.streaming_parser, feed_url, stop_at)
+            
+            articles, new_articles = [], []
+            for entry in entries:
+                article = self._parse_entry(entry, feed_url)
+                if article:
+                    articles.append(article)
+                    if self._is_new(entry, article, mark):
+                        new_articles.append(article)
+            
+            high_water = self._high_water(entries, articles, mark)
+            if stop_at:
+                # Everything below the previous top entry is unchanged
+                parsed = {article.url_key for article in articles}
+                articles += [article for article in cached['articles'] if article.url_key not in parsed]
+                articles = articles[:limit]
+                if high_water:
+                    high_water['ordered'] = self._is_ordered(articles)
+            
+            self.feed_cache.store(feed_url, list(articles), limit, content_hash, etag, last_modified,
+                                  high_water)
+            
+            logger.info(f"Fetched {len(articles)} articles from {feed_url} ({len(new_articles)} new)")
+            return articles, new_articles, self._status('ok', len(articles), time.monotonic() - started,
+                                                        cache='miss', new=len(new_articles))
+        
+        except Exception as e:
+            logger.error(f"Error fetching feed {feed_url}: {str(e)}")
+            return [], [], self._status('error', 0, time.monotonic() - started, str(e))
+    
+    @staticmethod
+    def _is_new(entry, article: Article, mark: Optional[Dict]) -> bool:
+        """Whether an entry is above the feed's high-water mark"""
+        if not mark:
+            return True
+        if entry_key(entry) == mark['guid']:
+            return False
+        # Undated entries can't be placed against the mark; count them as new
+        return not article.published_ts or article.published_ts >= mark['published_ts']
+    
+    @staticmethod
+    def _is_ordered(articles: List[Article]) -> bool:
+        """Whether the dated articles of a feed are listed newest first"""
+        times = [article.published_ts for article in articles if article.published_ts]
+        return all(newer >= older for newer, older in zip(times, times[1:]))
+    
+    def _high_water(self, entries: List, articles: List[Article], mark: Optional[Dict]) -> Optional[Dict]:
+        """
+        New high-water mark after parsing `entries` (None if nothing was parsed)
+        
+        The mark is the key of the top entry and the newest publish time seen,
+        plus whether the feed lists newest first (only then can a later fetch
+        stop parsing at the mark).
+        """
+        if not entries:
+            return None
+        newest = max((article.published_ts for article in articles), default=0)
+        return {
+            'guid': entry_key(entries[0]),
+            'published_ts': max(newest, mark['published_ts'] if mark else 0),
+            'ordered': self._is_ordered(articles)
+        }
+    
+    def _download_feed(self, feed_url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Dict]:
+        """
+        Download a feed body, bounded by the per-feed timeout
+        
+        Args:
+            feed_url: RSS feed URL
+            headers: Extra request headers (conditional GET validators)
+        
+        Returns:
+            Tuple of (status code, raw feed bytes, response headers)
+        """
+        request = urllib.request.Request(feed_url, headers={'User-Agent': USER_AGENT, **(headers or {})})
+        try:
+            with urllib.request.urlopen(request, timeout=self.feed_timeout) as response:
+                return getattr(response, 'status', 200) or 200, response.read(), dict(response.headers or {})
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, b'', dict(e.headers or {})
+            raise
+    
+    @staticmethod
+    def _status(status: str, count: int, duration: float, error: Optional[str] = None,
+                cache: Optional[str] = None, new: Optional[int] = None) -> Dict:
+        """Build a per-feed status entry for the fetch report"""
+        return {
+            'status': status,
+            'count': count,
+            'new': new,
+            'duration': round(duration, 3),
+            'error': error,
+            'cache': cache
+        }
+    
+    def get_feed_health(self) -> Dict[str, Dict]:
+        """Get latency percentiles, error rate, health score and circuit state per feed"""
+        return self.health.get_health()
+    
+    def get_cache_stats(self) -> Dict[str, Dict]:
+        """Get conditional-GET cache hit/miss counts per feed"""
+        return self.feed_cache.get_stats()
+    
+    def _parse_entry(self, entry, source_url: str) -> Optional[Article]:
         """
         Parse a single RSS entry into article format
         
         Args:
-            entry: feedparser entry object
+            entry: Feed entry (feedparser entry or streaming parser dict)
             source_url: Source RSS feed URL
-            
+        
         Returns:
-            Article dictionary or None if parsing fails
+            Article or None if parsing fails
         """
         try:
-            # Extract published date
+            # Extract published date as an epoch (0 when the feed gives none)
             published = entry.get('published', '')
-            published_parsed = entry.get('published_parsed', None)
+            published_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+            published_ts = calendar.timegm(published_parsed) if published_parsed else 0
             
             # Get summary/description
             summary = entry.get('summary', entry.get('description', ''))
@@ -90,42 +422,57 @@ class NewsFetcher:
                 summary = re.sub('<[^<]+?>', '', summary)
                 summary = summary.strip()[:500]  # Limit length
             
-            article = {
-                'title': entry.get('title', '').strip(),
-                'link': entry.get('link', '').strip(),
-                'summary': summary,
-                'published': published,
-                'published_parsed': published_parsed,
-                'source': source_url,
-                'fetched_at': datetime.now().isoformat()
-            }
+            title = entry.get('title', '').strip()
+            link = entry_url(entry)
             
             # Validate required fields
-            if not article['title'] or not article['link']:
+            if not title or not link:
                 logger.warning(f"Skipping article with missing title or link")
                 return None
             
-            return article
-            
+            url_key = canonicalize_url(link)
+            return Article(
+                title=title,
+                link=link,
+                url_key=url_key,
+                summary=summary,
+                published=published,
+                published_ts=published_ts,
+                source=source_url,
+                fetched_at=int(time.time()),
+                id=article_id(url_key)
+            )
+        
         except Exception as e:
             logger.error(f"Error parsing entry: {str(e)}")
             return None
     
-    def get_article_by_url(self, url: str) -> Optional[Dict]:
+    def get_article_by_url(self, url: str) -> Optional[Article]:
         """
-        Fetch a specific article by URL
+        Get a specific article by URL from the article index
+        
+        Every article a fetch returns is indexed, so an article that is not
+        in the index was never fetched (or has been evicted since).
         
         Args:
-            url: Article URL to fetch
-            
+            url: Article URL to look up (any variant with the same canonical form)
+        
         Returns:
-            Article dictionary or None if not found
+            Article or None if not found
         """
-        articles = self.fetch_latest_articles(limit=50)
-        for article in articles:
-            if article['link'] == url:
-                return article
-        return None
+        return self.index.get_by_url(url)
+    
+    def get_article_by_id(self, article_id: str) -> Optional[Article]:
+        """
+        Get a specific article by its stable ID from the article index
+        
+        Args:
+            article_id: Article ID (see article_index.article_id)
+        
+        Returns:
+            Article or None if not found
+        """
+        return self.index.get(article_id)
 
 
 if __name__ == "__main__":
@@ -133,10 +480,14 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     
     fetcher = NewsFetcher()
-    articles = fetcher.fetch_latest_articles(limit=3)
+    articles, report = fetcher.fetch_with_report(limit=3)
     
     print(f"\n✅ Fetched {len(articles)} articles\n")
     
+    for feed_url, status in report.items():
+        print(f"   [{status['status']}] {status['duration']:.2f}s  {feed_url}")
+    print()
+    
     for i, article in enumerate(articles[:3], 1):
         print(f"{i}. {article['title']}")
         print(f"   Link: {article['link']}")
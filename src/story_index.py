@@ -0,0 +1,361 @@
+"""
+Twitter News Curator - Story Index Module
+Groups near-duplicate articles from different feeds into stories (MinHash LSH)
+"""
+
+import base64
+import hashlib
+import heapq
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from pathlib import Path
+
+from article import Article
+from file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures must match between runs and processes
+_rng = random.Random(1729)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+# Articles with fewer distinct words are too terse to compare reliably
+MIN_WORDS = 5
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+STOPWORDS = frozenset("""
+    a about after all also an and any are as at be been but by can could did do does for from had has
+    have he her his how i if in into is it its just more most new not now of on one or our out over
+    says said she so than that the their them then there these they this to up us was we were what
+    when which who will with would you your
+""".split())
+
+
+def shingles(title: str, summary: str = '', summary_words: int = 50) -> Set[str]:
+    """
+    Distinctive words of an article
+    
+    Word sets (not word sequences) are used because different outlets
+    rephrase the same announcement; the names and numbers stay the same.
+    
+    Args:
+        title: Article title
+        summary: Article summary
+        summary_words: Only the start of the summary is used (the rest is
+            often boilerplate)
+    
+    Returns:
+        Set of lowercased words without stopwords
+    """
+    words = WORD_PATTERN.findall(title.lower())
+    words += WORD_PATTERN.findall(summary.lower())[:summary_words]
+    return {word for word in words if word not in STOPWORDS}
+
+
+@lru_cache(maxsize=100_000)
+def _word_hashes(word: str) -> Tuple[int, ...]:
+    """The word's value under every permutation (words repeat a lot between articles)"""
+    h = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+    return tuple(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for a, b in PERMUTATIONS)
+
+
+def minhash(words: Iterable[str]) -> Tuple[int, ...]:
+    """
+    MinHash signature of a word set
+    
+    The fraction of positions where two signatures agree estimates the
+    Jaccard similarity of the sets.
+    """
+    vectors = [_word_hashes(word) for word in words]
+    if not vectors:
+        return (MAX_HASH,) * NUM_PERM
+    return tuple(map(min, zip(*vectors)))
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class StoryIndex:
+    """
+    Locality-sensitive index of recent article signatures
+    
+    Signatures are cut into bands; articles sharing any band are candidates
+    and are compared in full, so an insert or lookup only touches a handful
+    of articles however many are indexed. Articles older than the window
+    are evicted from a heap ordered by time.
+    
+    A new article joins the story of its most similar indexed article
+    (at least `threshold` estimated Jaccard similarity) or starts a new
+    story named after its own ID. The index file is read on first use.
+    Thread-safe: one lock covers indexing, eviction and saving, so the web
+    app's background refresh and request threads can share an index.
+    """
+    
+    def __init__(self, index_file: str = "data/story_index.json", window_hours: float = 48,
+                 threshold: float = 0.3, band_size: int = 3):
+        """
+        Initialize StoryIndex
+        
+        Args:
+            index_file: Path to JSON file persisting the index (shared by
+                every process that fetches, so story IDs agree)
+            window_hours: How long an article can attract new members
+            threshold: Minimum estimated Jaccard similarity of title and
+                summary words for two articles to be the same story
+            band_size: Signature values per LSH band; smaller bands find
+                less similar pairs but produce more candidates
+        """
+        self.index_file = Path(index_file)
+        self.window = window_hours * 3600
+        self.threshold = threshold
+        self.band_size = band_size
+        self.bands = NUM_PERM // band_size
+        
+        # key -> (signature, story_id, timestamp)
+        self._entries: Dict[str, Tuple[Tuple[int, ...], str, int]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self._by_time: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(self.index_file.with_suffix('.lock'))
+        self._file_mtime = None
+        self._dirty = False
+        self._loaded = False
+    
+    def _ensure_loaded(self):
+        """Read the index file on first use (caller holds the lock)"""
+        if not self._loaded:
+            self._loaded = True
+            self._refresh()
+            logger.info(f"Loaded {len(self._entries)} articles into story index")
+    
+    def _band_keys(self, signature: Tuple[int, ...]):
+        size = self.band_size
+        return [(band, signature[band * size:(band + 1) * size]) for band in range(self.bands)]
+    
+    def _insert(self, key: str, signature: Tuple[int, ...], story_id: str, timestamp: int):
+        self._entries[key] = (signature, story_id, timestamp)
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+        heapq.heappush(self._by_time, (timestamp, key))
+        self._dirty = True
+    
+    def _remove(self, key: str):
+        signature, _, _ = self._entries.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+        self._dirty = True
+    
+    def _evict(self, now: float):
+        cutoff = now - self.window
+        while self._by_time and self._by_time[0][0] < cutoff:
+            timestamp, key = heapq.heappop(self._by_time)
+            entry = self._entries.get(key)
+            if entry and entry[2] == timestamp:
+                self._remove(key)
+    
+    def find(self, signature: Tuple[int, ...]) -> Optional[str]:
+        """
+        Story of the most similar indexed article
+        
+        Args:
+            signature: MinHash signature (see minhash)
+        
+        Returns:
+            Story ID, or None if nothing indexed is similar enough
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._find(signature)
+    
+    def _find(self, signature: Tuple[int, ...]) -> Optional[str]:
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        
+        best, best_score = None, self.threshold
+        for key in candidates:
+            other, story_id, _ = self._entries[key]
+            score = similarity(signature, other)
+            if score >= best_score:
+                best, best_score = story_id, score
+        return best
+    
+    def assign(self, article: Article) -> str:
+        """
+        Set article.story_id, indexing the article
+        
+        Args:
+            article: Article with id, title and summary
+        
+        Returns:
+            The story ID
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._assign(article)
+    
+    def _assign(self, article: Article) -> str:
+        """assign() (caller holds the lock)"""
+        key = article.id or article.url_key
+        entry = self._entries.get(key)
+        if entry:
+            article.story_id = entry[1]
+            return entry[1]
+        
+        words = shingles(article.title, article.summary)
+        if len(words) < MIN_WORDS:
+            # A story of its own: short texts share most of their few words by chance
+            article.story_id = key
+            return key
+        
+        signature = minhash(words)
+        story_id = self._find(signature) or key
+        self._insert(key, signature, story_id, article.published_ts or article.fetched_at or int(time.time()))
+        article.story_id = story_id
+        return story_id
+    
+    def assign_many(self, articles: List[Article]) -> int:
+        """
+        Assign stories to a fetched batch and persist the index
+        
+        Articles are indexed oldest first, so a story is named after the
+        first outlet that reported it.
+        
+        Returns:
+            Number of articles that joined an existing story
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._refresh()
+            self._evict(time.time())
+            joined = 0
+            for article in sorted(articles, key=lambda a: a.published_ts or a.fetched_at):
+                key = article.id or article.url_key
+                known = key in self._entries
+                if self._assign(article) != key and not known:
+                    joined += 1
+            self._save()
+        return joined
+    
+    def story_ids(self) -> Set[str]:
+        with self._lock:
+            self._ensure_loaded()
+            return {story_id for _, story_id, _ in self._entries.values()}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+    
+    def refresh(self):
+        """Pick up articles other processes indexed since the last load or save"""
+        with self._lock:
+            self._refresh()
+    
+    def _refresh(self):
+        """refresh() (caller holds the lock)"""
+        try:
+            mtime = os.stat(self.index_file).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._file_mtime:
+            return
+        
+        with self._file_lock:
+            self._merge_file()
+    
+    def _merge_file(self):
+        """Add entries from the index file that this process doesn't have (caller holds both locks)"""
+        try:
+            self._file_mtime = os.stat(self.index_file).st_mtime_ns
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error loading story index: {e}")
+            return
+        
+        dirty = self._dirty
+        for key, (encoded, story_id, timestamp) in entries.items():
+            if key not in self._entries:
+                signature = tuple(array('I', base64.b64decode(encoded)))
+                if len(signature) == NUM_PERM:
+                    self._insert(key, signature, story_id, timestamp)
+        self._dirty = dirty
+    
+    def save(self):
+        """Merge with the index file and write it back (atomic replace)"""
+        with self._lock:
+            self._save()
+    
+    def _save(self):
+        """save() (caller holds the lock)"""
+        if not self._dirty:
+            return
+        
+        try:
+            with self._file_lock:
+                self._merge_file()
+                self._evict(time.time())
+                entries = {
+                    key: (base64.b64encode(array('I', signature).tobytes()).decode('ascii'), story_id, timestamp)
+                    for key, (signature, story_id, timestamp) in self._entries.items()
+                }
+                self.index_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.index_file.with_suffix('.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_file, self.index_file)
+                self._file_mtime = os.stat(self.index_file).st_mtime_ns
+                self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving story index: {e}")
+
+
+if __name__ == "__main__":
+    # Benchmark: insert cost at tens of thousands of articles
+    import tempfile
+    
+    now = int(time.time())
+    count = 50_000
+    vocabulary = [f"word{i}" for i in range(20_000)]
+    words = random.Random(7)
+    batch = [
+        Article(title=' '.join(words.choices(vocabulary, k=10)), link=f"https://example.com/{i}",
+                summary=' '.join(words.choices(vocabulary, k=30)), id=f"b{i}", published_ts=now)
+        for i in range(count)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        index = StoryIndex(Path(tmp) / "stories.json")
+        started = time.perf_counter()
+        for article in batch[:count // 2]:
+            index.assign(article)
+        first_half = (time.perf_counter() - started) / (count // 2)
+        started = time.perf_counter()
+        for article in batch[count // 2:]:
+            index.assign(article)
+        second_half = (time.perf_counter() - started) / (count // 2)
+        
+        print(f"\n🧩 Story index with {len(index):,} articles")
+        print(f"   insert (0-25k)  {first_half * 1e6:6.0f} µs")
+        print(f"   insert (25-50k) {second_half * 1e6:6.0f} µs\n")
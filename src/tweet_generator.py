@@ -6,11 +6,107 @@ Generates engaging tweets using Google Gemini AI
 import google.generativeai as genai
 import json
 import logging
-import random
-from typing import Dict, Optional, List
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, Optional, List, Tuple
+
+from generation_cache import GenerationCache
+from rate_limiter import TokenBucket
+from tweet_text import compose_tweet, pick_hashtags, weighted_length
+from url_utils import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
+# Bump when _build_prompt or tweet post-processing changes: cached tweets are then regenerated
+PROMPT_VERSION = 3
+
+# Labels models put in front of the tweet ("Tweet:", "**Draft:**", "Here's your tweet:")
+LABEL_PREFIX = re.compile(r"^(?:\*\*)?(?:tweet|draft|here(?:'s| is) (?:a|the|your) tweet)\s*:\s*(?:\*\*)?\s*",
+                          re.IGNORECASE)
+QUOTE_PAIRS = {'"': '"', '\u201c': '\u201d', "'": "'", '\u00ab': '\u00bb'}
+URL = re.compile(r'https?://\S+')
+LINK_PLACEHOLDER = re.compile(r'\[(?:link|url|article link)\]', re.IGNORECASE)
+TRAILING_HASHTAGS = re.compile(r'(?:\s*#\w+)+$')
+HASHTAG = re.compile(r'#(\w+)')
+SENTENCE_END = re.compile(r'[.!?\u2026](?=\s|$)|[\u3002\uff01\uff1f]')
+
+# Openers the prompt suggests, a number up front, or a question as the first sentence
+HOOK = re.compile(r"^(?:here(?:'s| is) (?:why|what|how)|plot twist|unpopular opinion|hot take|this changes everything"
+                  r"|nobody|everyone|\d|[^.!?]*\?)", re.IGNORECASE)
+NUMBERED_LINE = re.compile(r'^\s*(?:\*\*)?(?:\d+[.):]|[-*\u2022])(?:\*\*)?\s+(.+?)\s*$', re.MULTILINE)
+WORD = re.compile(r"[a-z0-9']+")
+
+# Share of each local check in a candidate's score (candidates.weights overrides)
+CANDIDATE_WEIGHTS = {'length': 0.3, 'hook': 0.25, 'hashtags': 0.15, 'novelty': 0.3}
+
+
+def repair_tweet(text: str, article_link: str, max_chars: int, max_hashtags: int) -> str:
+    """
+    Fix the usual formatting slips of a generated tweet without calling the model
+    
+    Deterministic: strips a "Tweet:" style label and wrapping quotes, removes
+    the article link and [link] placeholders (the link is appended when the
+    tweet is formatted), drops trailing hashtags (configured ones are appended
+    too) and turns inline hashtags beyond max_hashtags into plain words. Text
+    longer than max_chars (weighted as X counts it) is cut after the last
+    sentence that fits; if no sentence fits it is left long for validation
+    to reject.
+    
+    Args:
+        text: Model output
+        article_link: Article URL
+        max_chars: Weighted length left for the text once hashtags and link are appended
+        max_hashtags: Hashtags allowed in the text
+    
+    Returns:
+        Repaired text
+    """
+    link = canonicalize_url(article_link)
+    text = URL.sub(lambda m: '' if canonicalize_url(m.group().rstrip('.,;:!?)')) == link else m.group(), text)
+    text = LINK_PLACEHOLDER.sub('', text)
+    text = TRAILING_HASHTAGS.sub('', text.strip())
+    
+    for _ in range(2):
+        text = LABEL_PREFIX.sub('', text).strip()
+        if len(text) > 1 and QUOTE_PAIRS.get(text[0]) == text[-1]:
+            text = text[1:-1].strip()
+    
+    kept = 0
+    def limit_hashtag(match):
+        nonlocal kept
+        kept += 1
+        return match.group() if kept <= max_hashtags else match.group(1)
+    text = HASHTAG.sub(limit_hashtag, text)
+    
+    text = ' '.join(text.split()).rstrip(' :-\u2014')
+    if weighted_length(text) > max_chars:
+        cut = 0
+        for match in SENTENCE_END.finditer(text):
+            if weighted_length(text[:match.end()]) > max_chars:
+                break
+            cut = match.end()
+        if cut >= 20:
+            text = text[:cut]
+    return text
+
+
+def split_candidates(text: str) -> List[str]:
+    """
+    Tweets of a multi-candidate reply: its numbered (or bulleted) lines, else its non-empty lines
+    
+    Markdown bold is dropped (X shows the asterisks); the rest is left to repair_tweet.
+    """
+    lines = NUMBERED_LINE.findall(text) or [line.strip() for line in text.splitlines() if line.strip()]
+    return [line.replace('**', '').strip() for line in lines]
+
+
+def _words(text: str) -> set:
+    return set(WORD.findall(URL.sub('', text).lower()))
+
 
 class TweetGenerator:
     """Generates engaging tweets using AI"""
@@ -32,60 +128,315 @@ class TweetGenerator:
         model_name = ai_settings.get('model', 'gemini-1.5-flash')
         
         self.model = genai.GenerativeModel(model_name)
+        self.model_name = model_name
         self.tweet_style = self.config.get('tweet_style', {})
         self.max_length = self.tweet_style.get('max_length', 280)
         self.temperature = ai_settings.get('temperature', 0.9)
         
+        # API calls, accepted tweets and retry reasons (see get_stats)
+        self._stats_lock = threading.Lock()
+        self._stats = Counter()
+        self._retry_reasons = Counter()
+        
+        # Every API call (retries included, from any thread) takes a token
+        self.max_concurrency = ai_settings.get('max_concurrency', 4)
+        requests_per_minute = ai_settings.get('requests_per_minute', 10)
+        self.rate_limiter = (
+            TokenBucket.per_minute(requests_per_minute, ai_settings.get('burst', self.max_concurrency))
+            if requests_per_minute else None
+        )
+        
+        cache_settings = self.config.get('generation_cache', {})
+        self.cache = None
+        if cache_settings.get('enabled', True):
+            self.cache = GenerationCache(
+                cache_settings.get('cache_file', 'data/generation_cache.json'),
+                max_entries=cache_settings.get('max_entries', 2000),
+                ttl_hours=cache_settings.get('ttl_hours', 168),
+                max_pending=cache_settings.get('max_pending', 50),
+                flush_interval=cache_settings.get('flush_interval', 5.0)
+            )
+        
+        # Alternatives drafted per request for the dashboard (see generate_candidates)
+        self.candidate_settings = self.config.get('candidates', {})
+        self.candidate_count = self.candidate_settings.get('count', 3)
+        self.recent_tweet_count = self.candidate_settings.get('recent_tweets', 20)
+        
         logger.info(f"Initialized TweetGenerator with model: {model_name}")
     
-    def generate_tweet(self, article: Dict, retry_count: int = 0) -> Optional[str]:
+    def generate_tweet(self, article: Dict, retry_count: int = 0, temperature: Optional[float] = None,
+                       use_cache: bool = True) -> Optional[str]:
         """
         Generate an engaging tweet from an article
         
+        A tweet generated before for the same article, prompt version, model
+        and temperature is served from the generation cache without an API call.
+        
         Args:
             article: Article dictionary with title, summary, link
             retry_count: Current retry attempt
+            temperature: Sampling temperature (defaults to ai_settings.temperature)
+            use_cache: False always asks the model (the new tweet is still cached)
             
         Returns:
             Generated tweet text or None if generation fails
         """
-        max_retries = self.config.get('ai_settings', {}).get('max_retries', 3)
+        tweet_text, _ = self._generate(article, retry_count, temperature, use_cache)
+        return tweet_text
+    
+    def generate_candidates(self, article: Dict, count: Optional[int] = None, temperature: Optional[float] = None,
+                            recent_tweets: List[str] = (), use_cache: bool = True) -> List[Dict]:
+        """
+        Generate alternative tweets in a single model call, best first
+        
+        The model is asked for `count` numbered tweets at once. Each one is
+        repaired and validated like a single tweet, then scored locally (see
+        score_candidates), so choosing between alternatives costs one request.
+        
+        Args:
+            article: Article dictionary with title, summary, link
+            count: Alternatives to ask for (defaults to candidates.count)
+            temperature: Sampling temperature (defaults to ai_settings.temperature)
+            recent_tweets: Text of our recent tweets; candidates repeating them score lower
+            use_cache: False always asks the model (the new candidates are still cached)
+        
+        Returns:
+            Scored candidates, best first (empty if generation failed)
+        """
+        tweets, _ = self._generate_tweets(article, count or self.candidate_count, temperature=temperature,
+                                          use_cache=use_cache)
+        return self.score_candidates(tweets, article['link'], recent_tweets)
+    
+    def score_candidates(self, tweets: List[str], article_link: str, recent_tweets: List[str] = ()) -> List[Dict]:
+        """
+        Score tweets locally and rank them
+        
+        Each check gives 0-1 and the score is their weighted mean
+        (candidates.weights):
+        - length: inside candidates.target_length (weighted), falling off over 100 chars
+        - hook: leads with a hook opener, a number or a question
+        - hashtags: inline plus appended hashtags within max_hashtags
+        - novelty: 1 minus the word overlap with the most similar recent tweet
+        
+        Args:
+            tweets: Tweet texts (without hashtags and link)
+            article_link: Article URL
+            recent_tweets: Text of our recent tweets
+        
+        Returns:
+            Dicts with content, full_tweet, char_count, score and per-check scores, best first
+        """
+        low, high = self.candidate_settings.get('target_length', [200, 240])
+        weights = {**CANDIDATE_WEIGHTS, **self.candidate_settings.get('weights', {})}
+        total_weight = sum(weights.values()) or 1
+        max_hashtags = self.tweet_style.get('max_hashtags', 2)
+        appended = len(self._hashtags(article_link))
+        recent = [_words(tweet) for tweet in recent_tweets]
+        
+        candidates = []
+        for tweet_text in tweets:
+            length = weighted_length(tweet_text)
+            words = _words(tweet_text)
+            overlap = max((len(words & other) / len(words | other) for other in recent if words | other), default=0.0)
+            extra_hashtags = max(0, len(HASHTAG.findall(tweet_text)) + appended - max_hashtags)
+            scores = {
+                'length': max(0.0, 1 - max(low - length, length - high, 0) / 100),
+                'hook': 1.0 if HOOK.match(tweet_text) else 0.0,
+                'hashtags': max(0.0, 1 - 0.5 * extra_hashtags),
+                'novelty': 1 - overlap
+            }
+            full_tweet = self.format_final_tweet(tweet_text, article_link)
+            candidates.append({
+                'content': tweet_text,
+                'full_tweet': full_tweet,
+                'char_count': weighted_length(full_tweet),
+                'score': round(sum(weights.get(name, 0) * value for name, value in scores.items()) / total_weight, 3),
+                'scores': {name: round(value, 2) for name, value in scores.items()}
+            })
+        
+        candidates.sort(key=lambda candidate: candidate['score'], reverse=True)
+        return candidates
+    
+    def generate_many(self, articles: List[Dict], max_concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        Generate tweets for several articles concurrently
+        
+        Up to `max_concurrency` articles are drafted at once, and every API
+        request goes through the shared rate limiter, so a batch takes about
+        len(articles) / max_concurrency round trips, or as long as the quota
+        (ai_settings.requests_per_minute) allows, whichever is slower.
+        
+        Args:
+            articles: Article dictionaries with title, summary, link
+            max_concurrency: Parallel requests (defaults to ai_settings.max_concurrency)
+        
+        Returns:
+            One result per article, in the same order: dict with article,
+            tweet (None if generation failed), error and duration
+        """
+        if not articles:
+            return []
+        workers = max(1, min(max_concurrency or self.max_concurrency, len(articles)))
         
-        if retry_count >= max_retries:
-            logger.error(f"Max retries ({max_retries}) reached for tweet generation")
-            return None
+        started = time.monotonic()
+        # The whole batch's generations are cached with one write
+        cache_batch = self.cache.batch() if self.cache is not None else nullcontext()
+        with cache_batch, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tweet-gen") as executor:
+            results = list(executor.map(self._generate_result, articles))
         
+        failed = sum(1 for result in results if result['tweet'] is None)
+        logger.info(f"Generated {len(results) - failed}/{len(results)} tweets "
+                    f"in {time.monotonic() - started:.1f}s ({workers} at a time)")
+        return results
+    
+    def _generate_result(self, article: Dict) -> Dict:
+        """Generate one tweet for generate_many; never raises"""
+        started = time.monotonic()
         try:
-            prompt = self._build_prompt(article)
-            
-            logger.info("Generating tweet with AI...")
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=self.temperature,
-                    max_output_tokens=150,
-                )
-            )
-            
-            tweet_text = response.text.strip()
+            tweet_text, error = self._generate(article)
+        except Exception as e:
+            tweet_text, error = None, str(e)
+        return {
+            'article': article,
+            'tweet': tweet_text,
+            'error': error,
+            'duration': round(time.monotonic() - started, 3)
+        }
+    
+    def _generate(self, article: Dict, retry_count: int = 0, temperature: Optional[float] = None,
+                  use_cache: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Generate a tweet, retrying failed or invalid responses
+        
+        Returns:
+            Tuple of (tweet text, None) on success, or (None, reason the last
+            attempt failed)
+        """
+        tweets, error = self._generate_tweets(article, 1, retry_count, temperature, use_cache)
+        return (tweets[0], None) if tweets else (None, error)
+    
+    def _generate_tweets(self, article: Dict, count: int, retry_count: int = 0, temperature: Optional[float] = None,
+                         use_cache: bool = True) -> Tuple[List[str], Optional[str]]:
+        """
+        Generate up to `count` tweets in one model call, retrying failed or invalid responses
+        
+        Every response goes through repair_tweet before validation, so only
+        output that can't be fixed locally costs another model call. Invalid
+        candidates of a multi-tweet reply are dropped; the model is asked
+        again only when none is left.
+        
+        Returns:
+            Tuple of (valid tweets, None) on success, or ([], reason the last
+            attempt failed)
+        """
+        max_retries = self.config.get('ai_settings', {}).get('max_retries', 3)
+        temperature = self.temperature if temperature is None else temperature
+        max_hashtags = self.tweet_style.get('max_hashtags', 2)
+        link = article['link']
+        error = "No attempts left"
+        
+        prompt = self._build_prompt(article, count)
+        cache_key = None
+        if self.cache is not None:
+            # The style shapes repairs and validation (length budget, hashtags), not just the prompt
+            cache_key = GenerationCache.make_key(PROMPT_VERSION, self.model_name, temperature, prompt,
+                                                 self.tweet_style)
+            cached = self.cache.get(cache_key) if use_cache else None
+            if cached:
+                # Repaired tweets are single lines, so candidates are cached one per line; a hit
+                # is still checked against the current limits, and one that fails is a miss
+                tweets = [tweet for tweet in cached.split('\n') if self._validation_error(tweet, link) is None]
+                if tweets:
+                    logger.info(f"✅ Using cached tweet{'s' if len(tweets) > 1 else ''} ({len(tweets)})")
+                    return tweets, None
+                logger.info("Cached tweet no longer passes validation, generating a new one")
+        
+        reason = None
+        for attempt in range(retry_count, max_retries):
+            if attempt > retry_count:
+                logger.info(f"Retrying ({reason})... (attempt {attempt + 1}/{max_retries})")
+                self._count(retry=reason)
             
-            # Validate tweet
-            if self._validate_tweet(tweet_text, article['link']):
-                logger.info(f"✅ Generated tweet ({len(tweet_text)} chars)")
-                return tweet_text
-            else:
-                logger.warning("Generated tweet failed validation, retrying...")
-                return self.generate_tweet(article, retry_count + 1)
+            try:
+                logger.info("Generating tweet with AI...")
+                self._count('api_calls')
+                response = self._generate_content(prompt, temperature, max_output_tokens=150 * count)
+                
+                raw_text = response.text.strip()
+                tweets, reasons = [], []
+                for raw_tweet in (split_candidates(raw_text) if count > 1 else [raw_text]):
+                    tweet_text = repair_tweet(raw_tweet, link, self._text_budget(link), max_hashtags)
+                    
+                    # Validate tweet
+                    reason = self._validation_error(tweet_text, link)
+                    if reason is not None:
+                        reasons.append(reason)
+                    elif tweet_text not in tweets:
+                        if tweet_text != raw_tweet:
+                            logger.info("Repaired model output locally")
+                            self._count('repaired')
+                        tweets.append(tweet_text)
+                
+                if tweets:
+                    if count > 1:
+                        logger.info(f"✅ Generated {len(tweets)}/{count} candidate tweets"
+                                    + (f" (dropped: {', '.join(reasons)})" if reasons else ""))
+                    else:
+                        logger.info(f"✅ Generated tweet ({weighted_length(tweets[0])} chars)")
+                    self._count('accepted')
+                    if cache_key:
+                        self.cache.put(cache_key, '\n'.join(tweets))
+                    return tweets, None
+                
+                reason = reasons[0] if reasons else 'too short'
+                error = f"Generated tweet failed validation: {reason}"
+                logger.warning(error)
             
-        except Exception as e:
-            logger.error(f"Error generating tweet: {str(e)}")
-            if retry_count < max_retries - 1:
-                logger.info(f"Retrying... (attempt {retry_count + 2}/{max_retries})")
-                return self.generate_tweet(article, retry_count + 1)
-            return None
-    
-    def _build_prompt(self, article: Dict) -> str:
-        """Build the AI prompt for tweet generation with rich content focus"""
+            except Exception as e:
+                reason = 'api error'
+                error = str(e)
+                logger.error(f"Error generating tweet: {error}")
+        
+        logger.error(f"Max retries ({max_retries}) reached for tweet generation")
+        self._count('failed')
+        return [], error
+    
+    def _count(self, counter: Optional[str] = None, retry: Optional[str] = None):
+        with self._stats_lock:
+            if counter:
+                self._stats[counter] += 1
+            if retry:
+                self._stats['retries'] += 1
+                self._retry_reasons[retry] += 1
+    
+    def get_stats(self) -> Dict:
+        """Get model calls per accepted tweet, local repairs and retries by reason"""
+        with self._stats_lock:
+            accepted = self._stats['accepted']
+            return {
+                'api_calls': self._stats['api_calls'],
+                'accepted': accepted,
+                'failed': self._stats['failed'],
+                'repaired': self._stats['repaired'],
+                'retries': self._stats['retries'],
+                'retry_reasons': dict(self._retry_reasons),
+                'calls_per_tweet': round(self._stats['api_calls'] / accepted, 2) if accepted else None
+            }
+    
+    def _generate_content(self, prompt: str, temperature: float, max_output_tokens: int = 150):
+        """One model request, within the rate limit"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        return self.model.generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+            )
+        )
+    
+    def _build_prompt(self, article: Dict, count: int = 1) -> str:
+        """Build the AI prompt for tweet generation with rich content focus (count > 1 asks for numbered alternatives)"""
         title = article.get('title', '')
         summary = article.get('summary', '')
         
@@ -132,8 +483,26 @@ GOOD: "Python devs: 80% majority. JavaScript devs: Still somehow running the wor
 
 NOW WRITE: Create ONE tweet following all rules above. Do NOT include quotation marks around it. End with the link: {article.get('link', '')}"""
 
+        if count > 1:
+            prompt = prompt.replace(
+                "NOW WRITE: Create ONE tweet following all rules above. Do NOT include quotation marks around it.",
+                f"NOW WRITE: Create {count} different tweets following all rules above, each in a different "
+                f"content style. Put each tweet on its own line, numbered 1 to {count}, with nothing else. "
+                f"Do NOT include quotation marks around them."
+            )
         return prompt
     
+    def _hashtags(self, article_link: str) -> List[str]:
+        """Hashtags appended to the tweet for an article (the same pick every time)"""
+        all_hashtags = self.tweet_style.get('hashtags', ['#Tech', '#AI'])
+        max_hashtags = self.tweet_style.get('max_hashtags', 2)
+        return pick_hashtags(all_hashtags, max_hashtags, article_link)
+    
+    def _text_budget(self, article_link: str) -> int:
+        """Weighted length left for the text once hashtags and link are appended"""
+        suffix = compose_tweet('', self._hashtags(article_link), article_link)
+        return self.max_length - weighted_length(suffix) - 1  # space before the suffix
+    
     def _validate_tweet(self, tweet_text: str, article_link: str) -> bool:
         """
         Validate generated tweet meets requirements
@@ -145,36 +514,35 @@ NOW WRITE: Create ONE tweet following all rules above. Do NOT include quotation
         Returns:
             True if valid, False otherwise
         """
-        # Get hashtags
-        all_hashtags = self.tweet_style.get('hashtags', ['#Tech', '#AI'])
-        max_hashtags = self.tweet_style.get('max_hashtags', 2)
-        selected_hashtags = random.sample(all_hashtags, min(max_hashtags, len(all_hashtags)))
-        hashtags_str = ' '.join(selected_hashtags)
+        return self._validation_error(tweet_text, article_link) is None
         
-        # Build full tweet
-        full_tweet = f"{tweet_text} {hashtags_str} {article_link}"
-        
-        # Check length
-        if len(full_tweet) > self.max_length:
-            logger.warning(f"Tweet too long: {len(full_tweet)} chars (max: {self.max_length})")
-            return False
+    def _validation_error(self, tweet_text: str, article_link: str) -> Optional[str]:
+        """Why a generated tweet is rejected ('too long', 'too short', 'formatting'), or None"""
+        # Check the length of the tweet exactly as it will be posted
+        length = weighted_length(self.format_final_tweet(tweet_text, article_link))
+        if length > self.max_length:
+            logger.warning(f"Tweet too long: {length} chars (max: {self.max_length})")
+            return 'too long'
         
         # Check if tweet is too short
         if len(tweet_text.strip()) < 20:
             logger.warning("Tweet too short")
-            return False
+            return 'too short'
         
         # Check for common AI mistakes
         if tweet_text.startswith('"') or tweet_text.startswith('Tweet:'):
             logger.warning("Tweet has formatting issues")
-            return False
+            return 'formatting'
         
-        return True
+        return None
     
     def format_final_tweet(self, content: str, article_link: str) -> str:
         """
         Format the final tweet with hashtags and link
         
+        This is the tweet that was validated: hashtags are picked by the
+        article link, so formatting the same content again gives the same tweet.
+        
         Args:
             content: Main tweet content
             article_link: Article URL
@@ -182,23 +550,106 @@ NOW WRITE: Create ONE tweet following all rules above. Do NOT include quotation
         Returns:
             Formatted final tweet
         """
-        # Get random hashtags
-        all_hashtags = self.tweet_style.get('hashtags', ['#Tech', '#AI'])
-        max_hashtags = self.tweet_style.get('max_hashtags', 2)
-        selected_hashtags = random.sample(all_hashtags, min(max_hashtags, len(all_hashtags)))
-        hashtags_str = ' '.join(selected_hashtags)
-        
-        # Build full tweet
-        full_tweet = f"{content} {hashtags_str} {article_link}"
-        
-        return full_tweet
+        return compose_tweet(content, self._hashtags(article_link), article_link)
+    
+    def close(self):
+        """Write cached generations that are still unsaved"""
+        if self.cache is not None:
+            self.cache.close()
 
 
 if __name__ == "__main__":
-    # Test the tweet generator
+    # Test the tweet generator (--bench: batch drafting against a stand-in model, no API key needed)
     import os
+    import sys
     from dotenv import load_dotenv
     
+    if '--bench' in sys.argv[1:]:
+        insight = "Plot twist: the boring part of this story is the one that will matter in five years."
+        
+        class StandInModel:
+            """Answers after a fixed delay, like a Gemini round trip"""
+            def __init__(self, replies):
+                self.replies = replies
+                self.calls = 0
+            
+            def generate_content(self, prompt, generation_config=None):
+                time.sleep(0.5)
+                self.calls += 1
+                link = prompt.rsplit('End with the link: ', 1)[-1]
+                reply = self.replies[self.calls % len(self.replies)].format(link=link)
+                return type('Response', (), {'text': reply})()
+        
+        config_path = 'config/config.json' if os.path.exists('config/config.json') else '../config/config.json'
+        generator = TweetGenerator('bench', config_path)
+        generator.model = StandInModel([insight])
+        generator.rate_limiter = TokenBucket.per_minute(600, burst=8)
+        generator.cache = None
+        backlog = [{'title': f"Story {i}", 'summary': '', 'link': f"https://example.com/{i}"} for i in range(30)]
+        
+        # The usual slips are repaired without another model call
+        flawed = [
+            f'"{insight}"',
+            f"Tweet: {insight} {{link}}",
+            f"{insight} [link] #AI #Tech #Future",
+            f"**Draft:** \u201c{insight}\u201d",
+            f"{insight} Meanwhile the hype cycle keeps spinning, the demos keep getting slicker, and "
+            f"the people actually shipping this stuff are quietly rewriting the rules for everyone else "
+            f"while the rest of us are still arguing about benchmarks",
+        ]
+        link = backlog[0]['link']
+        budget = generator._text_budget(link)
+        for text in flawed:
+            repaired = repair_tweet(text.format(link=link), link, budget, 1)
+            assert repaired == insight, repaired
+        
+        logging.disable(logging.INFO)
+        print(f"\n🤖 Drafting {len(backlog)} articles (0.5 s per request, 600 requests/min quota)")
+        for concurrency in (1, 4, 8):
+            started = time.monotonic()
+            results = generator.generate_many(backlog, max_concurrency=concurrency)
+            assert [result['article'] for result in results] == backlog
+            assert all(result['tweet'] for result in results)
+            print(f"   {concurrency} at a time  {time.monotonic() - started:5.1f} s")
+        
+        # Drafting the same backlog again is served from the generation cache
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            generator.cache = GenerationCache(os.path.join(tmp, "generations.json"))
+            generator.generate_many(backlog, max_concurrency=8)
+            started = time.monotonic()
+            results = generator.generate_many(backlog, max_concurrency=8)
+            assert generator.cache.get_stats()['hits'] == len(backlog)
+            print(f"   again, cached {(time.monotonic() - started) * 1000:5.1f} ms")
+            generator.cache.close()
+        
+        # Model calls per accepted tweet when most replies need fixing
+        generator.cache = None
+        generator.model = StandInModel(flawed + [insight])
+        generator.generate_many(backlog, max_concurrency=8)
+        stats = generator.get_stats()
+        logging.disable(logging.WARNING)
+        rejected = sum(not generator._validate_tweet(text.format(link=link), link) for text in flawed)
+        replies = len(flawed) + 1
+        print(f"   {rejected}/{replies} raw replies invalid: {replies / (replies - rejected):.1f} calls per tweet "
+              f"by retrying, {stats['calls_per_tweet']} with local repair ({stats['retries']} retries)")
+        
+        # Alternatives come from one request, ranked locally; one that repeats a recent tweet ranks last
+        fresh = ("Unpopular opinion: the model matters less than the data pipeline feeding it, and that "
+                 "is where this announcement quietly changes the game. Teams that own clean data will ship "
+                 "while everyone else argues about benchmarks.")
+        question = ("Why does every launch promise to replace engineers when the real winners are "
+                    "the engineers who learn to review machine-written code faster than anyone else?")
+        generator.model = StandInModel([f"Here are three takes:\n1. {insight} {{link}}\n2. **{fresh}**\n"
+                                        f"3. \"{question}\" #AI #Tech"])
+        calls = generator.model.calls
+        candidates = generator.generate_candidates(backlog[0], count=3, recent_tweets=[insight])
+        assert generator.model.calls - calls == 1
+        assert [candidate['content'] for candidate in candidates] == [fresh, question, insight], candidates
+        print(f"   3 alternatives in 1 request, best first: "
+              f"{', '.join(str(candidate['score']) for candidate in candidates)}\n")
+        sys.exit(0)
+    
     logging.basicConfig(level=logging.INFO)
     load_dotenv()
     
@@ -221,7 +672,7 @@ if __name__ == "__main__":
     
     if content:
         full_tweet = generator.format_final_tweet(content, test_article['link'])
-        print(f"✅ Generated Tweet ({len(full_tweet)} chars):")
+        print(f"✅ Generated Tweet ({weighted_length(full_tweet)} chars):")
         print(f"\n{full_tweet}\n")
     else:
         print("❌ Failed to generate tweet")
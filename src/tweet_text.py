@@ -0,0 +1,129 @@
+"""
+Twitter News Curator - Tweet Text Module
+Weighted tweet length as X counts it, and the one place a tweet is composed
+"""
+
+import random
+import re
+import unicodedata
+from typing import List, Sequence
+
+# X text rules (twitter-text v3): 280 weighted characters, every link counts
+# as a t.co link, most Latin text weighs 1 and everything else (CJK, most
+# symbols, each emoji sequence) weighs 2
+MAX_WEIGHTED_LENGTH = 280
+URL_LENGTH = 23
+EMOJI_WEIGHT = 2
+
+# Code points outside the weight-1 ranges 0-4351, 8192-8205, 8208-8223, 8242-8247
+HEAVY = re.compile('[^\u0000-\u10ff\u2000-\u200d\u2010-\u201f\u2032-\u2037]')
+
+# Linked without a protocol; ccTLD domains only when a path follows (x.ai/grok, not x.ai)
+GENERIC_TLDS = ('com', 'net', 'org', 'edu', 'gov', 'mil', 'int', 'info', 'biz', 'app', 'dev',
+                'news', 'tech', 'blog', 'xyz', 'online', 'site', 'cloud', 'page')
+COUNTRY_TLDS = ('ai', 'io', 'co', 'me', 'ly', 'tv', 'fm', 'gg', 'sh', 'so', 'to', 'uk', 'us', 'de',
+                'fr', 'es', 'it', 'nl', 'eu', 'ca', 'au', 'in', 'jp', 'cn', 'kr', 'br', 'ru', 'ch')
+
+_NO_TRAILING = r"""(?<![.,;:!?'"])"""
+_PATH = rf"""[/?#](?:[^\s()<>]|\([^\s()<>]*\))*{_NO_TRAILING}"""
+_DOMAIN = r"(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+"
+
+_URL = rf"""
+    https?://[^\s/?#()<>]+{_NO_TRAILING}(?:{_PATH})?
+  | (?<![\w@$\#./-]){_DOMAIN}(?:
+        (?:{'|'.join(GENERIC_TLDS)})(?![\w-])(?:{_PATH})?
+      | (?:{'|'.join(COUNTRY_TLDS)})(?![\w-])/(?:[^\s()<>]|\([^\s()<>]*\))*{_NO_TRAILING}
+    )
+"""
+
+# One emoji: a flag, a keycap, or pictographs (with variation selector, skin
+# tone and tag modifiers) joined by zero-width joiners
+_PICTOGRAPH = ('[\u203c\u2049\u2122\u2139\u2194-\u2199\u21a9\u21aa\u231a\u231b\u2328\u23cf'
+               '\u23e9-\u23f3\u23f8-\u23fa\u24c2\u25aa\u25ab\u25b6\u25c0\u25fb-\u25fe\u2600-\u27bf'
+               '\u2934\u2935\u2b05-\u2b07\u2b1b\u2b1c\u2b50\u2b55\u3030\u303d\u3297\u3299'
+               '\U0001f000-\U0001faff]|[\u00a9\u00ae]\ufe0f')
+_EMOJI_ELEMENT = f"(?:{_PICTOGRAPH})(?:[\ufe0f\u20e3\U0001f3fb-\U0001f3ff\U000e0020-\U000e007f])*"
+_EMOJI = (f"[\U0001f1e6-\U0001f1ff]{{2}}|[0-9#*]\ufe0f?\u20e3"
+          f"|{_EMOJI_ELEMENT}(?:\u200d{_EMOJI_ELEMENT})*")
+
+URL = re.compile(_URL, re.IGNORECASE | re.VERBOSE)
+ENTITY = re.compile(f"(?P<url>{_URL})|(?P<emoji>{_EMOJI})", re.IGNORECASE | re.VERBOSE)
+
+
+def _plain_length(text: str) -> int:
+    return len(text) + len(HEAVY.findall(text))
+
+
+def weighted_length(text: str) -> int:
+    """
+    Length of a tweet as X counts it against the 280 limit
+    
+    Text is NFC-normalized first (so "e" + combining accent counts once),
+    links count as URL_LENGTH whatever their real length, each emoji
+    sequence counts 2, and other characters count 1 or 2 by code point.
+    
+    Args:
+        text: Tweet text
+    
+    Returns:
+        Weighted length
+    """
+    text = unicodedata.normalize('NFC', text)
+    if text.isascii():
+        # No emoji or heavy characters: only links change the count
+        length = len(text)
+        for match in URL.finditer(text):
+            length += URL_LENGTH - (match.end() - match.start())
+        return length
+    
+    length = 0
+    position = 0
+    for match in ENTITY.finditer(text):
+        length += _plain_length(text[position:match.start()])
+        length += URL_LENGTH if match.lastgroup == 'url' else EMOJI_WEIGHT
+        position = match.end()
+    return length + _plain_length(text[position:])
+
+
+def pick_hashtags(hashtags: Sequence[str], count: int, key: str) -> List[str]:
+    """
+    Choose up to `count` hashtags, always the same ones for the same key
+    
+    Seeded by the key (the article link), so the tweet that was validated
+    is the tweet that gets posted, in this process or any other.
+    """
+    return random.Random(key).sample(list(hashtags), max(0, min(count, len(hashtags))))
+
+
+def compose_tweet(content: str, hashtags: Sequence[str], link: str) -> str:
+    """
+    Build the final tweet: content, hashtags, link, separated by single spaces
+    
+    Args:
+        content: Tweet text
+        hashtags: Hashtags to append
+        link: Article URL
+    
+    Returns:
+        Tweet text as it is validated and posted
+    """
+    return ' '.join(part for part in (content.strip(), ' '.join(hashtags), link) if part)
+
+
+if __name__ == "__main__":
+    # Benchmark: weighted length of generated tweets (edge cases are in tests/test_tweet_text.py)
+    import time
+    
+    fragments = ["Plot twist:", "https://techcrunch.com/2025/01/01/story/", "bit.ly/x", "x.ai/grok", "中文",
+                 "\U0001f9d1\U0001f3fe\u200d\U0001f4bb", "™", "café", "A\u030a", "\U0001f680\U0001f680",
+                 "(https://example.org/x)", "done.", "@user", "#AI"]
+    rng = random.Random(7)
+    corpus = [' '.join(rng.choices(fragments, k=rng.randint(1, 12))) for _ in range(20000)]
+    
+    started = time.perf_counter()
+    for text in corpus:
+        weighted_length(text)
+    per_tweet = (time.perf_counter() - started) / len(corpus)
+    
+    print(f"\n📏 Weighted length of {len(corpus):,} generated tweets")
+    print(f"   {per_tweet * 1e6:.1f} µs per tweet\n")
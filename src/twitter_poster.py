@@ -7,6 +7,8 @@ import tweepy
 import logging
 from typing import Optional
 
+from tweet_text import MAX_WEIGHTED_LENGTH, weighted_length
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,17 +48,18 @@ class TwitterPoster:
         Post a tweet
         
         Args:
-            text: Tweet text (max 280 characters)
+            text: Tweet text (max 280 characters, counted the way X counts them)
             
         Returns:
             Tweet ID if successful, None otherwise
         """
-        if len(text) > 280:
-            logger.error(f"Tweet too long: {len(text)} characters (max: 280)")
+        length = weighted_length(text)
+        if length > MAX_WEIGHTED_LENGTH:
+            logger.error(f"Tweet too long: {length} characters (max: {MAX_WEIGHTED_LENGTH})")
             return None
         
         try:
-            logger.info(f"Posting tweet ({len(text)} chars)...")
+            logger.info(f"Posting tweet ({length} chars)...")
             response = self.client.create_tweet(text=text)
             
             tweet_id = response.data['id']
@@ -142,7 +145,7 @@ if __name__ == "__main__":
         test_tweet = "🤖 Testing the Twitter News Curator bot! This is a test tweet. #AI #Tech"
         
         print(f"\nTest tweet: {test_tweet}")
-        print(f"Length: {len(test_tweet)} chars\n")
+        print(f"Length: {weighted_length(test_tweet)} chars\n")
         
         confirm = input("Post this test tweet? (y/n): ")
         
@@ -56,6 +56,7 @@ document.addEventListener('DOMContentLoaded', function () {
     document.querySelectorAll('.generate-tweet-btn').forEach(btn => {
         btn.addEventListener('click', async function () {
             const articleUrl = this.dataset.articleUrl;
+            const articleId = this.dataset.articleId;
 
             // Show progress modal
             const modal = document.getElementById('progress-modal');
@@ -84,7 +85,7 @@ document.addEventListener('DOMContentLoaded', function () {
                 const response = await fetch('/api/generate-tweet', {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ article_url: articleUrl })
+                    body: JSON.stringify({ article_url: articleUrl, article_id: articleId })
                 });
 
                 const data = await response.json();
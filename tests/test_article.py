@@ -0,0 +1,38 @@
+"""
+Tests for the Article record
+"""
+
+import json
+
+from article import Article, article_to_json
+
+
+def test_url_key_is_the_canonical_link():
+    article = Article(title="Story", link="https://example.com/story?utm_source=rss")
+    assert article.link == "https://example.com/story?utm_source=rss"
+    assert article.url_key == "https://example.com/story"
+    # A link that is already canonical is shared, not copied
+    plain = Article(title="Story", link="https://example.com/story")
+    assert plain.url_key is plain.link
+
+
+def test_dict_access_and_round_trip():
+    article = Article(title="Story", link="https://example.com/story", summary="Summary",
+                      published_ts=1736157600, source="https://example.com/rss", id="a1")
+    assert article['title'] == "Story" and article.get('missing', 'x') == 'x' and 'link' in article
+    copy = Article.from_dict(json.loads(json.dumps(article, default=article_to_json)))
+    assert copy == article
+
+
+def test_from_dict_reads_iso_fetched_at():
+    article = Article.from_dict({'title': "Story", 'link': "https://example.com/story",
+                                 'fetched_at': "2025-01-06T10:00:00", 'is_posted': True})
+    assert article.fetched_at > 0
+
+
+def test_hash_is_consistent_with_equality():
+    # Copies collapse in a set, the link variant of a story doesn't
+    story = Article(title="Story", link="https://example.com/story?utm_source=rss", id="a1")
+    variant = Article(title="Story", link="https://example.com/story", id="a1")
+    assert hash(story) == hash(variant) and story != variant
+    assert len({story, Article.from_dict(story.to_dict()), variant}) == 2
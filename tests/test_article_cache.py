@@ -0,0 +1,85 @@
+"""
+Tests for the shared article store
+"""
+
+import threading
+import time
+
+from article import Article
+from article_cache import ArticleCache
+from news_fetcher import NewsFetcher
+
+FEEDS = ["https://example.com/a.xml", "https://example.com/b.xml"]
+
+
+class FakeFetcher:
+    """Returns two articles per feed (once `release` is set) and remembers which threads fetched"""
+    
+    def __init__(self):
+        self.rss_feeds = list(FEEDS)
+        self.fetch_threads = []
+        self.release = threading.Event()
+        self.release.set()
+    
+    def fetch_with_report(self, limit, feeds=None):
+        feeds = feeds if feeds is not None else self.rss_feeds
+        self.fetch_threads.append(threading.current_thread().name)
+        self.release.wait()
+        now = int(time.time())
+        articles = [Article(title=f"Story {i}", link=f"{feed_url}/{i}", source=feed_url, published_ts=now - i)
+                    for feed_url in feeds for i in range(2)]
+        return articles, {feed_url: NewsFetcher._status('ok', 2, 0.1) for feed_url in feeds}
+
+
+def test_reads_fetch_missing_feeds_inline():
+    fetcher = FakeFetcher()
+    cache = ArticleCache(fetcher)
+    assert len(cache.get_articles(limit=2)) == 4
+    assert fetcher.fetch_threads == [threading.current_thread().name]
+    
+    status = cache.get_feed_status()
+    assert [status[url]['status'] for url in FEEDS] == ['ok', 'ok'] and status[FEEDS[0]]['stored'] == 2
+
+
+def test_background_refresh_only_never_fetches_inline():
+    fetcher = FakeFetcher()
+    cache = ArticleCache(fetcher)
+    cache.background_refresh_only = True
+    fetcher.release.clear()
+    
+    # Nothing stored yet: the read returns at once and the feeds are queued
+    assert cache.get_articles(limit=2) == []
+    assert cache.get_feed_status()[FEEDS[0]] == {'status': 'pending', 'stored': 0, 'age': None, 'refreshing': True}
+    
+    fetcher.release.set()
+    deadline = time.time() + 5
+    while cache.get_stats()['refreshing'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert threading.current_thread().name not in fetcher.fetch_threads
+    assert len(cache.get_articles(limit=2)) == 4
+
+
+def test_invalidate_drops_only_the_given_feeds():
+    fetcher = FakeFetcher()
+    cache = ArticleCache(fetcher)
+    cache.get_articles(limit=2)
+    
+    cache.invalidate([FEEDS[1]])
+    assert len(cache.get_feed_articles(FEEDS[0])) == 2 and cache.get_feed_articles(FEEDS[1]) == []
+    cache.invalidate()
+    assert cache.get_stats()['feeds'] == 0
+
+
+def test_refresh_started_before_invalidate_keeps_other_feeds():
+    fetcher = FakeFetcher()
+    cache = ArticleCache(fetcher)
+    fetcher.release.clear()
+    refresh = threading.Thread(target=cache.refresh, args=(2,))
+    refresh.start()
+    while not fetcher.fetch_threads:
+        time.sleep(0.01)
+    
+    cache.invalidate([FEEDS[1]])
+    fetcher.release.set()
+    refresh.join()
+    assert len(cache.get_feed_articles(FEEDS[0])) == 2 and cache.get_feed_articles(FEEDS[1]) == []
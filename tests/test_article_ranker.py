@@ -0,0 +1,60 @@
+"""
+Tests for article ranking
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from article import Article
+from article_ranker import ArticleRanker, TermCounts, hash_words
+
+TOPICS = ["🤖 Artificial Intelligence", "💻 Hardware", "🔐 Cybersecurity"]
+
+
+def test_unrelated_article_ranks_last():
+    now = time.time()
+    ranker = ArticleRanker(TOPICS, counts=TermCounts())
+    articles = [
+        Article(title="Nvidia unveils Blackwell GPUs for AI training", link="https://example.com/1",
+                summary="The chipmaker's new data center chips target large language model training.",
+                published_ts=int(now - 6 * 3600)),
+        Article(title="Local bakery wins award for sourdough", link="https://example.com/2",
+                summary="The family-run shop has been baking bread for forty years.",
+                published_ts=int(now - 600)),
+        Article(title="Ransomware gang breaches hospital network", link="https://example.com/3",
+                summary="Hackers exploited a vulnerability in remote access software.",
+                published_ts=int(now - 3 * 3600)),
+    ]
+    assert ranker.rank(articles, now)[-1].link == "https://example.com/2"
+    assert ArticleRanker(TOPICS, enabled=False).rank(articles, now) == articles
+
+
+def test_hash_words():
+    # Same word, same column: whatever its case or position; words split at punctuation
+    rows, columns = hash_words(["", "Hello, world!", "WORLD hello", "Über ÜBER", "snake_case"])
+    assert rows.tolist() == [1, 1, 2, 2, 3, 3, 4, 4]
+    assert columns[0] == columns[3] and columns[1] == columns[2] and columns[4] == columns[5]
+    assert len(hash_words([])[0]) == 0
+
+
+def test_precomputed_counts_match():
+    articles = [Article(title=f"AI chip startup {i}", link=f"https://example.com/{i}", summary="Funding news")
+                for i in range(10)]
+    stored = TermCounts()
+    stored.add(articles[:5])
+    assert len(stored) == 5
+    ours = ArticleRanker(TOPICS, counts=stored).score(articles, now=0)
+    cold = ArticleRanker(TOPICS, counts=TermCounts()).score(articles, now=0)
+    assert ours.tolist() == cold.tolist()
+
+
+def test_threads_share_a_small_cache():
+    # Overlapping batches through a cache too small to hold them
+    ranker = ArticleRanker(TOPICS, counts=TermCounts(max_size=50))
+    articles = [Article(title=f"AI chip startup {i}", link=f"https://example.com/t/{i}", summary="Funding news")
+                for i in range(400)]
+    expected = ranker.score(articles[:120], now=0).tolist()
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda start: [ranker.score(articles[start:start + 120], now=0)
+                                               for _ in range(20)], range(0, 400, 100)))
+    assert [scores.tolist() for scores in results[0]] == [expected] * 20
@@ -0,0 +1,72 @@
+"""
+Tests for the posted-article tracker
+"""
+
+from datetime import datetime
+
+import pytest
+
+from article_tracker import ArticleTracker
+from tracker_storage import JsonStorage, SQLiteStorage
+
+
+def test_mark_and_query(tmp_path):
+    tracker = ArticleTracker(tmp_path / "posted.json")
+    article = {'title': "Story", 'link': "https://example.com/story?utm_source=rss",
+               'source': "https://example.com/rss"}
+    assert not tracker.has_been_posted(article['link'])
+    tracker.mark_as_posted(article, tweet_id="123")
+    
+    # Any variant of the link counts as posted
+    assert tracker.has_been_posted("https://example.com/story")
+    assert tracker.get_posted_count() == 1 and tracker.get_recent_posts(1)[0]['title'] == "Story"
+    tracker.close()
+
+
+def test_over_capacity_seen_filter_is_rebuilt(tmp_path):
+    seen_settings = {'file': str(tmp_path / "seen.bloom"), 'capacity': 10}
+    small = ArticleTracker(tmp_path / "posted.json", seen_filter=seen_settings)
+    small.mark_many({'link': f"https://example.com/{i}"} for i in range(30))
+    small.close()
+    
+    reopened = ArticleTracker(tmp_path / "posted.json", seen_filter=seen_settings)
+    assert reopened.seen_capacity > 10
+    assert all(reopened.has_been_posted(f"https://example.com/{i}") for i in range(30))
+    reopened.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_imports_reach_a_running_tracker(tmp_path, backend):
+    # Old-dated posts another process imports reach a running tracker's filter, and a reopened one
+    def make_storage():
+        if backend == "json":
+            return JsonStorage(tmp_path / "shared.json")
+        return SQLiteStorage(tmp_path / "shared.db")
+    
+    seen_settings = {'file': str(tmp_path / "shared.bloom"), 'capacity': 1000}
+    old = [{'link': f"https://example.com/import/{i}", 'posted_at': datetime(2019, 1, 1).isoformat()}
+           for i in range(20)]
+    
+    first = ArticleTracker(storage=make_storage(), seen_filter=seen_settings)
+    first.mark_as_posted({'link': "https://example.com/new"})
+    first.close()
+    running = ArticleTracker(storage=make_storage(), seen_filter=seen_settings)
+    importer = ArticleTracker(storage=make_storage(), seen_filter=seen_settings)
+    importer.mark_many(old)
+    importer.close()
+    assert all(running.has_been_posted(article['link']) for article in old)
+    running.close()
+    
+    reopened = ArticleTracker(storage=make_storage(), seen_filter=seen_settings)
+    assert all(reopened.has_been_posted(article['link']) for article in old)
+    reopened.close()
+
+
+def test_retention_applies_on_startup(tmp_path):
+    tracker = ArticleTracker(tmp_path / "posted.json")
+    tracker.mark_many({'link': f"https://example.com/{i}"} for i in range(10))
+    tracker.close()
+    
+    reopened = ArticleTracker(tmp_path / "posted.json", max_history=4)
+    assert reopened.get_posted_count() == 4
+    reopened.close()
@@ -0,0 +1,37 @@
+"""
+Tests for the Bloom filter
+"""
+
+import pytest
+
+from bloom_filter import BloomFilter
+
+
+def test_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    bloom.update(f"https://example.com/news/{i}" for i in range(10_000))
+    assert all(f"https://example.com/news/{i}" in bloom for i in range(10_000))
+    false_positives = sum(f"https://example.org/other/{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+    assert len(bloom) <= 10_000 and not bloom.is_full
+
+
+def test_add_reports_new_items():
+    bloom = BloomFilter(capacity=100)
+    assert bloom.add("a") and not bloom.add("a")
+
+
+def test_save_and_load(tmp_path):
+    bloom = BloomFilter(capacity=1000)
+    bloom.update(f"https://example.com/news/{i}" for i in range(500))
+    bloom.save(tmp_path / "seen.bloom", b'2025-01-06T10:00:00')
+    
+    loaded, extra = BloomFilter.load(tmp_path / "seen.bloom")
+    assert extra == b'2025-01-06T10:00:00'
+    assert loaded.bits == bloom.bits and len(loaded) == len(bloom)
+
+
+def test_load_rejects_other_files(tmp_path):
+    (tmp_path / "seen.bloom").write_bytes(b'not a filter')
+    with pytest.raises(ValueError):
+        BloomFilter.load(tmp_path / "seen.bloom")
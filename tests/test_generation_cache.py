@@ -0,0 +1,76 @@
+"""
+Tests for the generated-tweet cache
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from generation_cache import GenerationCache
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "generations.json"
+
+
+def counting_saves(cache):
+    """Wrap cache._save_data; returns a list whose length is the number of saves"""
+    saves = []
+    save_data = cache._save_data
+    
+    def counted_save():
+        saves.append(1)
+        save_data()
+    
+    cache._save_data = counted_save
+    return saves
+
+
+def test_lru_and_write_behind(cache_file):
+    cache = GenerationCache(cache_file, max_entries=2000, ttl_hours=1, flush_interval=0)
+    saves = counting_saves(cache)
+    keys = [GenerationCache.make_key(1, "gemini", 0.9, f"prompt {i}") for i in range(2500)]
+    for i, key in enumerate(keys):
+        cache.put(key, f"Tweet {i}")
+    
+    # Written every max_pending puts, not per put
+    assert len(saves) == len(keys) // cache.max_pending
+    assert len(cache) == 2000 and cache.get(keys[0]) is None and cache.get(keys[-1]) == "Tweet 2499"
+    cache.close()
+
+
+def test_expired_entries_are_not_served(cache_file):
+    cache = GenerationCache(cache_file, ttl_hours=1, flush_interval=0)
+    cache.put("key", "Tweet")
+    cache._entries["key"]['created_at'] -= 7200
+    assert cache.get("key") is None
+    cache.close()
+
+
+def test_processes_share_entries(cache_file):
+    cache = GenerationCache(cache_file, flush_interval=0)
+    cache.put("saved", "Saved tweet")
+    cache.flush()
+    other = GenerationCache(cache_file, flush_interval=0)
+    assert other.get("saved") == "Saved tweet"
+    
+    # Their write doesn't drop our entry that is still unsaved
+    cache.put("ours", "Unsaved tweet")
+    time.sleep(0.01)  # distinct mtime
+    other.put("theirs", "Their tweet")
+    other.close()
+    assert cache.get("theirs") == "Their tweet" and cache.get("ours") == "Unsaved tweet"
+    
+    cache.close()
+    assert GenerationCache(cache_file, flush_interval=0).get("ours") == "Unsaved tweet"
+
+
+def test_batch_is_written_once(cache_file):
+    cache = GenerationCache(cache_file, flush_interval=0)
+    saves = counting_saves(cache)
+    with cache.batch(), ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda i: cache.put(f"batch {i}", f"Tweet {i}"), range(200)))
+    assert len(saves) == 1 and len(cache) == 200
+    cache.close()
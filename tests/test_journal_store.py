@@ -0,0 +1,64 @@
+"""
+Tests for the snapshot + journal store
+"""
+
+import json
+
+from journal_store import JournalStore
+
+
+def make_store(path, **kwargs):
+    kwargs.setdefault('compact_every', 10 ** 9)
+    store = JournalStore(path, fsync='never', **kwargs)
+    store.load()
+    return store
+
+
+def test_replay_drops_a_torn_tail(tmp_path):
+    store = make_store(tmp_path / "posts.json")
+    store.records.update({f"https://example.com/{i}": {'title': str(i)} for i in range(100)})
+    store.compact(background=False)
+    for i in range(20):
+        store.set(f"https://example.com/new/{i}", {'title': str(i)})
+    store.delete("https://example.com/0")
+    with open(store.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"op": "set", "key": "torn')
+    
+    reloaded = JournalStore(store.snapshot_file).load()
+    assert len(reloaded) == 119 and "torn" not in reloaded and "https://example.com/0" not in reloaded
+    assert reloaded == store.records
+    store.close()
+
+
+def test_compaction_keeps_other_processes_lines(tmp_path):
+    ours, theirs = make_store(tmp_path / "shared.json"), make_store(tmp_path / "shared.json")
+    ours.set("a", {})
+    theirs.set("b", {})
+    ours.compact()
+    ours.close()
+    theirs.close()
+    
+    with open(tmp_path / "shared.json", encoding='utf-8') as f:
+        assert sorted(json.load(f)) == ["a", "b"]
+    # close() folded the journal into the snapshot
+    assert (tmp_path / "shared.journal").stat().st_size == 0
+
+
+def test_refresh_and_keys_since(tmp_path):
+    ours, theirs = make_store(tmp_path / "shared.json"), make_store(tmp_path / "shared.json")
+    position = ours.position()
+    theirs.set_many([("a", {}), ("b", {})])
+    theirs.delete("a")
+    
+    assert ours.refresh()
+    assert sorted(ours.records) == ["b"]
+    assert ours.keys_since(position) == ["a", "b"]
+    assert ours.keys_since(ours.position()) == []
+    assert ours.keys_since("not a position") is None
+    
+    # A compaction rotates the journal: old positions no longer apply
+    theirs.compact(background=False)
+    ours.refresh()
+    assert ours.keys_since(position) is None
+    ours.close()
+    theirs.close()
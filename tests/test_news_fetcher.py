@@ -0,0 +1,49 @@
+"""
+Tests for NewsFetcher's fetch deadline handling
+"""
+
+import json
+import time
+
+import pytest
+
+from news_fetcher import NewsFetcher
+
+FEEDS = [f"https://example.com/feed{i}.xml" for i in range(3)]
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    config = {
+        'rss_feeds': FEEDS,
+        'fetch_settings': {'max_workers': 1, 'fetch_deadline': 0.3,
+                           'cache_file': str(tmp_path / "feed_cache.json")},
+        'article_index': {'index_file': str(tmp_path / "article_index.json")},
+        'story_clustering': {'enabled': False}
+    }
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(config))
+    fetcher = NewsFetcher(str(config_file))
+    
+    def slow_fetch(feed_url, limit):
+        time.sleep(0.5)
+        return [], [], NewsFetcher._status('ok', 0, 0.5)
+    
+    fetcher._fetch_feed = slow_fetch
+    return fetcher
+
+
+def test_parallel_deadline_skips_feeds_that_never_started(fetcher):
+    _, report = fetcher.fetch_with_report()
+    # One worker: the first feed was running at the deadline, the others still queued
+    assert [report[url]['status'] for url in FEEDS] == ['timeout', 'skipped', 'skipped']
+    health = fetcher.health.get_health()
+    assert health[FEEDS[0]]['samples'] == 1 and health[FEEDS[0]]['error_rate'] == 1
+    assert all(url not in health or health[url]['samples'] == 0 for url in FEEDS[1:])
+
+
+def test_sequential_deadline_skips_the_remaining_feeds(fetcher):
+    _, report = fetcher.fetch_with_report(parallel=False)
+    assert [report[url]['status'] for url in FEEDS] == ['ok', 'skipped', 'skipped']
+    health = fetcher.health.get_health()
+    assert all(url not in health or health[url]['samples'] == 0 for url in FEEDS[1:])
@@ -0,0 +1,23 @@
+"""
+Tests for the token bucket
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rate_limiter import TokenBucket
+
+
+def test_rate_holds_across_threads():
+    # 8 threads sharing a 20/s bucket with a burst of 5
+    bucket = TokenBucket(rate=20, capacity=5)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        times = sorted(executor.map(lambda _: bucket.acquire() and time.monotonic() - started, range(25)))
+    
+    # 5 immediately, then one every 50 ms: the last of 25 lands at ~1.0 s
+    assert times[4] < 0.05 and 0.9 < times[-1] < 1.2, times
+
+
+def test_acquire_times_out():
+    assert not TokenBucket(rate=1).acquire(2, timeout=0.1)
@@ -0,0 +1,60 @@
+"""
+Tests for story clustering
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from article import Article
+from story_index import StoryIndex
+
+COVERAGE = [
+    ("OpenAI launches GPT-5, its most capable model yet",
+     "OpenAI on Thursday released GPT-5, the next generation of the model behind ChatGPT, "
+     "with better reasoning and coding."),
+    ("OpenAI releases GPT-5 to all ChatGPT users",
+     "GPT-5 is rolling out today to ChatGPT users. OpenAI says the model is better at reasoning and coding."),
+    ("GPT-5 is here: OpenAI's new model brings better reasoning and coding to ChatGPT",
+     "OpenAI has released GPT-5, which is rolling out in ChatGPT starting today."),
+]
+UNRELATED = [
+    ("OpenAI raises $40 billion led by SoftBank", "The funding round values OpenAI at $300 billion."),
+    ("Nvidia unveils new Blackwell chips at GTC", "Nvidia announced its next generation of data center GPUs."),
+    ("Apple announces M4 MacBook Pro", "The new laptops ship next week with the M4 family of chips."),
+    ("OpenAI launches new ChatGPT agent mode", "ChatGPT can now use a browser to complete tasks, OpenAI said."),
+]
+
+
+def test_reports_of_one_story_cluster(tmp_path):
+    now = int(time.time())
+    index = StoryIndex(tmp_path / "stories.json")
+    articles = [
+        Article(title=title, link=f"https://outlet{i}.example/{i}", summary=summary, id=f"a{i}",
+                published_ts=now - 3600 + i)
+        for i, (title, summary) in enumerate(COVERAGE + UNRELATED)
+    ]
+    index.assign_many(articles)
+    stories = [article.story_id for article in articles]
+    assert len(set(stories[:len(COVERAGE)])) == 1
+    assert len(set(stories)) == 1 + len(UNRELATED)
+    
+    # Another process sees the same stories
+    other = StoryIndex(tmp_path / "stories.json")
+    assert len(other) == len(index) and other.story_ids() == index.story_ids()
+
+
+def test_threads_share_one_index(tmp_path):
+    now = int(time.time())
+    vocabulary = [f"word{i}" for i in range(20_000)]
+    words = random.Random(7)
+    shared = StoryIndex(tmp_path / "shared.json")
+    batches = [
+        [Article(title=' '.join(words.choices(vocabulary, k=10)), link=f"https://example.com/{t}/{i}",
+                 summary=' '.join(words.choices(vocabulary, k=30)), id=f"t{t}-{i}", published_ts=now)
+         for i in range(500)]
+        for t in range(8)
+    ]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(shared.assign_many, batches))
+    assert len(shared) == len(StoryIndex(tmp_path / "shared.json")) == 8 * 500
@@ -0,0 +1,99 @@
+"""
+Tests for the posted-article storage backends, run against both
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from tracker_storage import JsonStorage, SQLiteStorage, TrackerStorage
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def open_storage(request, tmp_path):
+    """Opens storages on one shared file (several can be open at once, like separate processes)"""
+    opened = []
+    
+    def open_one():
+        if request.param == "json":
+            storage = JsonStorage(tmp_path / "posted.json", fsync='never')
+        else:
+            storage = SQLiteStorage(tmp_path / "posted.db")
+        opened.append(storage)
+        return storage
+    
+    yield open_one
+    for storage in opened:
+        storage.close()
+
+
+def record(i, posted_at=None):
+    posted_at = posted_at or datetime(2025, 1, 1) + timedelta(minutes=i)
+    return {'title': f"Article {i}", 'posted_at': posted_at.isoformat(), 'tweet_id': str(i),
+            'source': "https://example.com/rss", 'story_id': f"s{i % 3}"}
+
+
+def test_put_get_and_contains(open_storage):
+    storage = open_storage()
+    storage.put_many((f"https://example.com/{i}", record(i)) for i in range(10))
+    storage.put("https://example.com/x", record(10))
+    
+    assert storage.count() == 11
+    assert storage.contains("https://example.com/3") and not storage.contains("https://example.com/11")
+    assert storage.get("https://example.com/3")['title'] == "Article 3"
+    assert storage.contains_many(["https://example.com/1", "https://example.com/99"]) == {"https://example.com/1"}
+    assert storage.contains_stories(["s0", "s9"]) == {"s0"}
+    
+    storage.delete_many(["https://example.com/1"])
+    assert not storage.contains("https://example.com/1") and storage.count() == 10
+
+
+def test_recent_and_evict(open_storage):
+    storage = open_storage()
+    storage.put_many((f"https://example.com/{i}", record(i)) for i in range(100))
+    
+    assert [r['url'] for r in storage.recent(3)] == [f"https://example.com/{i}" for i in (99, 98, 97)]
+    assert storage.evict(before=(datetime(2025, 1, 1) + timedelta(minutes=10)).isoformat()) == 10
+    assert storage.trim(50) == 40
+    assert storage.count() == 50 and storage.recent(100)[-1]['url'] == "https://example.com/50"
+
+
+def test_meta(open_storage):
+    storage = open_storage()
+    assert storage.get_meta("migrated") is None
+    storage.set_meta("migrated", "1")
+    assert open_storage().get_meta("migrated") == "1"
+
+
+def test_changes_since_follows_write_order(open_storage):
+    ours, theirs = open_storage(), open_storage()
+    ours.put("https://example.com/new", record(1))
+    urls, position = ours.changes_since()
+    assert list(urls) == ["https://example.com/new"]
+    
+    # Old-dated posts written later are changes too
+    theirs.put_many((f"https://example.com/old/{i}", record(i, datetime(2019, 1, 1))) for i in range(3))
+    urls, position = ours.changes_since(position)
+    assert sorted(urls) == [f"https://example.com/old/{i}" for i in range(3)]
+    urls, position = ours.changes_since(position)
+    assert list(urls) == []
+    
+    # An unknown position means everything
+    urls, _ = ours.changes_since("unknown")
+    assert len(list(urls)) == 4
+
+
+def test_clear(open_storage):
+    storage = open_storage()
+    storage.put("https://example.com/1", record(1))
+    storage.clear()
+    assert storage.count() == 0 and storage.recent(5) == []
+
+
+def test_backends_must_implement_the_interface():
+    class Incomplete(TrackerStorage):
+        def contains(self, url):
+            return False
+    
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,64 @@
+"""
+Tests for TweetGenerator's use of the generation cache (against a stand-in model)
+"""
+
+import json
+
+import pytest
+
+from tweet_generator import TweetGenerator
+
+LONG = ("Plot twist: the boring part of this story is the one that will matter in five years, "
+        "and almost nobody covering the launch is talking about it yet.")
+SHORT = "Plot twist: the boring part is the one that matters."
+ARTICLE = {'title': "Story", 'summary': "", 'link': "https://example.com/story"}
+
+
+class StandInModel:
+    """Replies with the current `reply` and counts requests"""
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+    
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        return type('Response', (), {'text': self.reply})()
+
+
+@pytest.fixture
+def generator(tmp_path):
+    config = {
+        'tweet_style': {'max_length': 280, 'hashtags': ['#Tech'], 'max_hashtags': 1},
+        'ai_settings': {'requests_per_minute': 0, 'max_retries': 2},
+        'generation_cache': {'cache_file': str(tmp_path / "generations.json"), 'flush_interval': 0}
+    }
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(config))
+    generator = TweetGenerator('test', str(config_file))
+    generator.model = StandInModel(LONG)
+    yield generator
+    generator.close()
+
+
+def test_repeat_generation_is_served_from_the_cache(generator):
+    assert generator.generate_tweet(ARTICLE) == LONG
+    assert generator.generate_tweet(ARTICLE) == LONG
+    assert generator.model.calls == 1
+
+
+def test_cached_tweet_failing_current_limits_is_a_miss(generator):
+    generator.generate_tweet(ARTICLE)
+    
+    # Limits tightened without a config change the key sees: the hit is rechecked
+    generator.max_length = 100
+    generator.model.reply = SHORT
+    assert generator.generate_tweet(ARTICLE) == SHORT
+    assert generator.model.calls == 2
+
+
+def test_style_change_is_a_miss(generator):
+    generator.generate_tweet(ARTICLE)
+    generator.tweet_style = dict(generator.tweet_style, hashtags=['#AI'])
+    generator.generate_tweet(ARTICLE)
+    assert generator.model.calls == 2
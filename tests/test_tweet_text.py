@@ -0,0 +1,66 @@
+"""
+Tests for tweet_text: weighted length against X's counting rules, and tweet composition
+"""
+
+import random
+
+import pytest
+
+from tweet_text import compose_tweet, pick_hashtags, weighted_length
+
+CASES = {
+    "": 0,
+    "a" * 280: 280,
+    "Read https://example.com/a/very/long/path?with=query&and=more#fragment": 28,
+    "Check https://t.co/abc.": 30,
+    "(see http://en.wikipedia.org/wiki/Foo_(bar))": 29,
+    "python.org and www.example.com/news": 51,
+    "x.ai ships, x.ai/grok links": 41,
+    "Node.js, e.g. U.S. 3.5": 22,
+    "日本語のニュース": 16,
+    "한국어": 6,
+    "“quoted” — fine": 15,
+    "wait…": 6,
+    "café cafe\u0301": 9,
+    "\U0001f44d \U0001f44d\U0001f3fd ❤\ufe0f": 8,
+    "\U0001f468\u200d\U0001f469\u200d\U0001f467\u200d\U0001f466": 2,
+    "\U0001f1fa\U0001f1f8\U0001f1ef\U0001f1f5": 4,
+    "1\ufe0f\u20e3 #\u20e3": 5,
+    "\U0001f3f4\U000e0067\U000e0062\U000e0073\U000e0063\U000e0074\U000e007f": 2,
+    "© 2025 ©\ufe0f": 9,
+    "@user $TSLA #AI": 15,
+}
+
+# Fragments of known weight that generated tweets are built from
+FRAGMENTS = [(text, weight) for text, weight in CASES.items() if text and ' ' not in text] + [
+    ("Plot twist:", 11), ("https://techcrunch.com/2025/01/01/story/", 23), ("bit.ly/x", 23),
+    ("中文", 4), ("\U0001f9d1\U0001f3fe\u200d\U0001f4bb", 2), ("™", 2), ("ü", 1),
+    ("A\u030a", 1), ("\U0001f680\U0001f680", 4), ("(https://example.org/x)", 25), ("done.", 5),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES.items())
+def test_weighted_length_rule_cases(text, expected):
+    assert weighted_length(text) == expected
+
+
+def test_weighted_length_generated_tweets():
+    rng = random.Random(7)
+    for _ in range(20000):
+        parts = rng.choices(FRAGMENTS, k=rng.randint(1, 12))
+        text = ' '.join(part for part, _ in parts)
+        expected = sum(weight for _, weight in parts) + len(parts) - 1
+        assert weighted_length(text) == expected, text
+
+
+def test_pick_hashtags_is_stable_per_link():
+    tags = ['#AI', '#Tech', '#Innovation']
+    link = 'https://example.com/story'
+    assert pick_hashtags(tags, 2, link) == pick_hashtags(tags, 2, link)
+    # ...and varies between links
+    assert len({tuple(pick_hashtags(tags, 1, f"{link}/{i}")) for i in range(50)}) == 3
+
+
+def test_compose_tweet_strips_content():
+    link = 'https://example.com/story'
+    assert compose_tweet(" Big news ", [], link) == f"Big news {link}"
@@ -0,0 +1,33 @@
+"""
+Tests for URL canonicalization
+"""
+
+from url_utils import canonicalize_url, entry_url, url_key
+
+
+def test_variants_collapse_to_one_url():
+    variants = [
+        "http://Example.com/news/story-1/",
+        "https://example.com/news/story-1?utm_source=rss&utm_medium=feed",
+        "https://example.com:443/news/story-1#comments",
+        "https://EXAMPLE.com/news/story-1/?fbclid=abc123",
+    ]
+    assert len({canonicalize_url(url) for url in variants}) == 1
+
+
+def test_canonical_forms():
+    assert canonicalize_url("https://example.com/a?b=2&a=1&utm_campaign=x") == "https://example.com/a?a=1&b=2"
+    assert canonicalize_url("https://example.com") == "https://example.com/"
+    assert canonicalize_url("https://example.com:8080/a") == "https://example.com:8080/a"
+    assert canonicalize_url("mailto:news@example.com") == "mailto:news@example.com"
+
+
+def test_entry_url_prefers_the_original_link():
+    entry = {'link': "https://feeds.feedburner.com/~r/Example/~3/abc/",
+             'feedburner_origlink': "https://example.com/story?utm_source=feedburner"}
+    assert entry_url(entry) == "https://example.com/story?utm_source=feedburner"
+
+
+def test_url_key():
+    assert url_key({'link': "https://example.com/story?utm_source=feedburner"}) == "https://example.com/story"
+    assert url_key({'link': "https://example.com/x", 'url_key': "stored"}) == "stored"
@@ -8,6 +8,7 @@ from flask_cors import CORS
 import os
 import sys
 import json
+import atexit
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -18,9 +19,13 @@ import secrets
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from news_fetcher import NewsFetcher
+from article_cache import ArticleCache
+from feed_poller import FeedPoller
 from tweet_generator import TweetGenerator
 from article_tracker import ArticleTracker
+from article_ranker import ArticleRanker
 from twitter_poster import TwitterPoster
+from tweet_text import MAX_WEIGHTED_LENGTH, weighted_length
 
 # Load environment
 load_dotenv()
@@ -36,7 +41,12 @@ CORS(app)
 # Initialize bot components
 logger.info("Initializing bot components...")
 fetcher = NewsFetcher()
-tracker = ArticleTracker()
+tracker = ArticleTracker.from_config(fetcher.config)
+ranker = ArticleRanker.from_config(fetcher.config)
+
+# Routes read articles from the shared store; the poller keeps it fresh
+article_cache = ArticleCache.from_config(fetcher)
+poller = FeedPoller.from_config(fetcher, article_cache)
 
 gemini_key = os.getenv('GEMINI_API_KEY')
 generator = TweetGenerator(gemini_key) if gemini_key else None
@@ -51,6 +61,26 @@ twitter_creds = [
 poster = TwitterPoster(*twitter_creds) if all(twitter_creds) else None
 
 
+def shutdown():
+    """Stop polling, then write what is still buffered (posts, the journal, cached generations)"""
+    if poller.is_running():
+        poller.stop(timeout=fetcher.fetch_deadline)
+    if generator:
+        generator.close()
+    tracker.close()
+
+
+atexit.register(shutdown)
+
+
+@app.before_request
+def start_poller():
+    """Start the background feed poller with the first request"""
+    # Deferred so the debug reloader's parent process doesn't poll too
+    if fetcher.config.get('poller', {}).get('enabled', True) and not poller.is_running():
+        poller.start()
+
+
 @app.route('/')
 def dashboard():
     """Main dashboard"""
@@ -66,15 +96,31 @@ def dashboard():
     return render_template('dashboard.html', stats=stats, recent_posts=recent_posts)
 
 
+def article_views(articles_list, sort='score'):
+    """
+    Article dicts for the UI, marked posted and scored
+    
+    Works on copies - stored articles are shared. Best-scored first unless
+    sort is 'recent' (or ranking is disabled), which keeps newest first.
+    """
+    posted = tracker.posted_links(articles_list)
+    scores = ranker.score(articles_list)
+    views = [
+        dict(article.to_dict(), is_posted=article.link in posted, score=round(float(score), 3))
+        for article, score in zip(articles_list, scores)
+    ]
+    if ranker.enabled and sort != 'recent':
+        views.sort(key=lambda view: view['score'], reverse=True)
+    return views
+
+
 @app.route('/articles')
 def articles():
     """Browse fetched articles"""
     limit = int(request.args.get('limit', 20))
-    articles_list = fetcher.fetch_latest_articles(limit=limit)
-    
-    # Mark which ones are posted
-    for article in articles_list:
-        article['is_posted'] = tracker.has_been_posted(article['link'])
+    total = request.args.get('total', type=int)
+    articles_list = article_cache.get_articles(limit=limit, total_limit=total)
+    articles_list = article_views(articles_list, request.args.get('sort', 'score'))
     
     # Pass config for source selection
     config = {
@@ -91,29 +137,23 @@ def fetch_articles_api():
         data = request.json
         selected_sources = data.get('sources', fetcher.rss_feeds)
         limit = data.get('limit', 20)
+        total_limit = data.get('total_limit')
+        sort = data.get('sort', 'score')
         
         logger.info(f"Fetching articles from {len(selected_sources)} sources, limit={limit}")
         
-        # Temporarily update sources
-        original_feeds = fetcher.rss_feeds
-        fetcher.rss_feeds = selected_sources
-        
-        # Fetch articles
-        articles_list = fetcher.fetch_latest_articles(limit=limit)
-        
-        # Restore original feeds
-        fetcher.rss_feeds = original_feeds
-        
-        # Mark which ones are posted
-        for article in articles_list:
-            article['is_posted'] = tracker.has_been_posted(article['link'])
+        # Fetch articles (served from cache when fresh)
+        articles_list = article_cache.get_articles(limit=limit, sources=selected_sources,
+                                                   total_limit=total_limit)
+        articles_list = article_views(articles_list, sort)
         
         logger.info(f"Fetched {len(articles_list)} articles from {len(selected_sources)} sources")
         
         return jsonify({
             'success': True,
             'articles': articles_list,
-            'count': len(articles_list)
+            'count': len(articles_list),
+            'feed_status': article_cache.get_feed_status(selected_sources)
         })
     
     except Exception as e:
@@ -126,21 +166,32 @@ def fetch_articles_api():
         }), 500
 
 
+def draft_candidates(candidates):
+    """What the draft page needs of each candidate (the session lives in a size-limited cookie)"""
+    return [
+        {'full_tweet': candidate['full_tweet'], 'char_count': candidate['char_count'], 'score': candidate['score']}
+        for candidate in candidates
+    ]
+
+
 @app.route('/api/generate-tweet', methods=['POST'])
 def generate_tweet_api():
     """Generate tweet for an article"""
     try:
         data = request.json
         article_url = data.get('article_url')
+        article_id = data.get('article_id')
         
-        logger.info(f"Generate tweet request for: {article_url}")
+        logger.info(f"Generate tweet request for: {article_url or article_id}")
         
-        if not article_url:
+        if not article_url and not article_id:
             return jsonify({'error': 'article_url is required'}), 400
         
-        # Fetch articles and find the one
-        articles = fetcher.fetch_latest_articles(limit=50)
-        article = next((a for a in articles if a['link'] == article_url), None)
+        # Resolve from the article index - no network, and still works after
+        # the article has dropped out of the feed window
+        article = fetcher.get_article_by_id(article_id) if article_id else None
+        if not article and article_url:
+            article = fetcher.get_article_by_url(article_url)
         
         if not article:
             logger.error(f"Article not found: {article_url}")
@@ -150,27 +201,36 @@ def generate_tweet_api():
             logger.error("AI generator not initialized")
             return jsonify({'error': 'AI not configured. Check GEMINI_API_KEY in .env file.'}), 500
         
-        # Generate tweet
+        # Generate ranked alternatives in one call (repeat requests are served
+        # from the generation cache unless the client asks for fresh ones)
         logger.info("Generating tweet with AI...")
-        tweet_content = generator.generate_tweet(article)
+        candidates = generator.generate_candidates(
+            article,
+            recent_tweets=tracker.recent_tweets(generator.recent_tweet_count),
+            use_cache=not data.get('refresh', False)
+        )
         
-        if not tweet_content:
+        if not candidates:
             logger.error("Tweet generation returned empty")
             return jsonify({'error': 'Failed to generate tweet'}), 500
         
-        full_tweet = generator.format_final_tweet(tweet_content, article['link'])
-        logger.info(f"Tweet generated successfully: {len(full_tweet)} chars")
+        tweet_content = candidates[0]['content']
+        full_tweet = candidates[0]['full_tweet']
+        logger.info(f"Tweet generated successfully: {len(candidates)} candidates, "
+                    f"best {candidates[0]['char_count']} chars (score {candidates[0]['score']})")
         
         # Store in session for posting
-        session['current_article'] = article
+        session['current_article'] = article.to_dict()
         session['current_tweet'] = full_tweet
         session['current_content'] = tweet_content
+        session['current_candidates'] = draft_candidates(candidates)
         
         return jsonify({
             'content': tweet_content,
             'full_tweet': full_tweet,
-            'char_count': len(full_tweet),
-            'article': article
+            'char_count': candidates[0]['char_count'],
+            'candidates': candidates,
+            'article': article.to_dict()
         })
     
     except Exception as e:
@@ -201,24 +261,32 @@ def regenerate_tweet():
         print(f"Regenerating tweet for article: {article.get('title', 'Unknown')[:50]}...")
         print(f"Parameters: tone={tone}, temperature={temperature}")
         
-        # Generate new tweet
-        tweet_content = generator.generate_tweet(article, temperature=temperature)
+        # Generate new candidates - always fresh ones, never the cached drafts
+        candidates = generator.generate_candidates(
+            article,
+            temperature=temperature,
+            recent_tweets=tracker.recent_tweets(generator.recent_tweet_count),
+            use_cache=False
+        )
         
-        if not tweet_content:
+        if not candidates:
             return jsonify({'error': 'Failed to generate tweet. AI returned empty response.'}), 500
         
-        full_tweet = generator.format_final_tweet(tweet_content, article['link'])
+        tweet_content = candidates[0]['content']
+        full_tweet = candidates[0]['full_tweet']
         
         # Update session
         session['current_tweet'] = full_tweet
         session['current_content'] = tweet_content
+        session['current_candidates'] = draft_candidates(candidates)
         
         print(f"Regenerated tweet: {tweet_content[:50]}...")
         
         return jsonify({
             'content': tweet_content,
             'full_tweet': full_tweet,
-            'char_count': len(full_tweet),
+            'char_count': candidates[0]['char_count'],
+            'candidates': candidates,
             'success': True
         })
     
@@ -248,12 +316,15 @@ def post_tweet_api():
     # Allow editing
     data = request.json
     edited_tweet = data.get('tweet', full_tweet)
+    length = weighted_length(edited_tweet)
+    if length > MAX_WEIGHTED_LENGTH:
+        return jsonify({'error': f'Tweet too long: {length}/{MAX_WEIGHTED_LENGTH} characters'}), 400
     
     # Post
     tweet_id = poster.post_tweet(edited_tweet)
     
     if tweet_id:
-        tracker.mark_as_posted(article, tweet_id)
+        tracker.mark_as_posted(article, tweet_id, tweet_text=edited_tweet)
         
         return jsonify({
             'success': True,
@@ -264,17 +335,26 @@ def post_tweet_api():
         return jsonify({'error': 'Failed to post tweet'}), 500
 
 
+@app.route('/api/tweet-length', methods=['POST'])
+def tweet_length_api():
+    """Length of an edited tweet as X counts it (links 23, emoji and CJK 2)"""
+    text = (request.json or {}).get('tweet', '')
+    return jsonify({'char_count': weighted_length(text), 'max_length': MAX_WEIGHTED_LENGTH})
+
+
 @app.route('/draft')
 def draft_view():
     """View current draft"""
     article = session.get('current_article')
     tweet = session.get('current_tweet')
     content = session.get('current_content')
+    candidates = session.get('current_candidates', [])
     
     if not article or not tweet:
         return render_template('draft.html', error="No draft available")
     
-    return render_template('draft.html', article=article, tweet=tweet, content=content)
+    return render_template('draft.html', article=article, tweet=tweet, content=content,
+                           char_count=weighted_length(tweet), candidates=candidates)
 
 
 @app.route('/history')
@@ -291,6 +371,7 @@ def settings():
     """Bot settings and configuration"""
     config = {
         'rss_feeds': fetcher.rss_feeds,
+        'feed_health': fetcher.get_feed_health(),
         'ai_model': generator.model.model_name if generator else None,
         'twitter_username': poster.username if poster else None,
         'auto_post': os.getenv('AUTO_POST', 'false')
@@ -357,6 +438,12 @@ def monitor_stats():
                 'ai_connected': generator is not None,
                 'uptime': 'Active'
             },
+            'feed_health': fetcher.get_feed_health(),
+            'feed_cache': fetcher.get_cache_stats(),
+            'generation_cache': generator.cache.get_stats() if generator and generator.cache is not None else None,
+            'generation': generator.get_stats() if generator else None,
+            'article_cache': article_cache.get_stats(),
+            'poller': poller.get_status(),
             'recent_logs': [log.strip() for log in recent_logs if log.strip()]
         }
         
@@ -510,20 +597,29 @@ def remove_rss_feed():
 
 def reload_config():
     """Reload configuration in all components without restart"""
-    global fetcher, generator
+    global fetcher, generator, ranker
     
     try:
         # Reload RSS feeds
         with open('config/config.json', 'r') as f:
             config = json.load(f)
         
+        removed = set(fetcher.rss_feeds) - set(config['rss_feeds'])
         fetcher.rss_feeds = config['rss_feeds']
+        # Added feeds are fetched as missing; the others keep their articles
+        if removed:
+            article_cache.invalidate(removed)
         logger.info(f"Reloaded {len(fetcher.rss_feeds)} RSS feeds")
         
+        # Rebuild the ranker so saved topic preferences apply
+        ranker = ArticleRanker.from_config(config)
+        logger.info(f"Reloaded {len(ranker.topics)} topic preferences")
+        
         # Reload AI settings
         if generator:
             generator.config = config
             generator.tweet_style = config.get('tweet_style', {})
+            generator.max_length = generator.tweet_style.get('max_length', 280)
             generator.temperature = config.get('ai_settings', {}).get('temperature', 0.9)
             logger.info("Reloaded AI settings")
         